@@ -0,0 +1,94 @@
+"""
+Bitboard storage for a player's board
+Keeps one integer mask per row plus a compact color plane
+"""
+
+
+class BitBoard:
+    """Board backend using row bitmasks for collision and line checks"""
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.rows = [0] * height
+        # One byte per cell indexing into the palette (0 = empty)
+        self.colors = bytearray(width * height)
+        self.palette = [0]
+        self._palette_index = {}
+    
+    def __len__(self):
+        return self.height
+    
+    def __getitem__(self, y):
+        """Get row y as a tuple of colors (0 for empty), like the list board
+        
+        The row is a copy, so it is read-only; place blocks with set_cell.
+        """
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("board row out of range")
+        start = y * self.width
+        palette = self.palette
+        return tuple([palette[c] for c in self.colors[start:start + self.width]])
+    
+    def __iter__(self):
+        for y in range(self.height):
+            yield self[y]
+    
+    def _color_index(self, color):
+        """Get the palette index for a color, adding it if needed"""
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            if index > 255:
+                raise ValueError("bitboard palette is limited to 255 colors")
+            self.palette.append(color)
+            self._palette_index[color] = index
+        return index
+    
+    def is_filled(self, x, y):
+        """Check if the cell at (x, y) is occupied"""
+        return (self.rows[y] >> x) & 1 == 1
+    
+    def set_cell(self, x, y, color):
+        """Place a colored block at (x, y)"""
+        self.rows[y] |= 1 << x
+        self.colors[y * self.width + x] = self._color_index(color)
+    
+    def collides(self, piece, dx=0, dy=0):
+        """Check if piece collides with board boundaries or placed blocks"""
+        px = piece.x + dx
+        py = piece.y + dy
+        table = piece.tables[piece.rotation_index]
+        
+        if px + table.min_x < 0 or px + table.max_x >= self.width:
+            return True
+        
+        rows = self.rows
+        for by, mask in table.row_masks:
+            y = py + by
+            if y >= self.height:
+                return True
+            if y >= 0:
+                shifted = mask << px if px >= 0 else mask >> -px
+                if rows[y] & shifted:
+                    return True
+        
+        return False
+    
+    def clear_rows(self, lines):
+        """Remove the given rows and shift everything above them down"""
+        if not lines:
+            return
+        
+        cleared = set(lines)
+        width = self.width
+        kept = [y for y in range(self.height) if y not in cleared]
+        empty = len(self.rows) - len(kept)
+        
+        self.rows = [0] * empty + [self.rows[y] for y in kept]
+        colors = bytearray(empty * width)
+        for y in kept:
+            colors += self.colors[y * width:(y + 1) * width]
+        self.colors = colors
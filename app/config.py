@@ -3,8 +3,6 @@ Configuration file for Tetris game
 Contains all game constants, colors, and settings
 """
 
-import pygame
-
 # Screen dimensions
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
@@ -12,6 +10,9 @@ BOARD_WIDTH = 10
 BOARD_HEIGHT = 20
 CELL_SIZE = 30
 
+# Board storage backend (True = row bitmasks + color plane, False = nested lists)
+USE_BITBOARD = False
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -41,6 +42,45 @@ FPS = 60
 INITIAL_FALL_SPEED = 500  # milliseconds
 LEVEL_SPEED_REDUCTION = 50  # milliseconds per level
 MIN_FALL_SPEED = 50  # minimum milliseconds
+# Most rows gravity can move a piece in one update (20G = a full board height)
+MAX_GRAVITY_ROWS = 20
+
+# Fixed simulation step, independent of the render frame rate
+SIMULATION_STEP_MS = 10
+# Most simulation steps run for one rendered frame; a longer stall is skipped
+MAX_SIMULATION_STEPS = 25
+
+# Menu, rankings and game-over screens block on input for up to this long
+# (ms) instead of redrawing every frame
+IDLE_WAIT_MS = 1000
+
+# Boards in party mode (the menu's tiled N-player game)
+PARTY_PLAYERS = 8
+# Menu value of party mode; a mode id, unlike the 1 and 2 player modes it
+# is not the player count
+PARTY_MODE = 4
+
+# Piece randomizer: 'random' (independent draws) or 'bag' (7-bag)
+RANDOMIZER_MODE = 'random'
+# Number of upcoming pieces each player can see (next piece included)
+PREVIEW_PIECES = 1
+
+# High-score journal size (bytes) that triggers folding it into the snapshot
+SCORE_JOURNAL_COMPACT_BYTES = 64 * 1024
+
+# Transposition table for AI search: entries, and eviction policy
+# ('lru' or 'depth' for depth-preferred replacement)
+TRANSPOSITION_TABLE_SIZE = 1 << 16
+TRANSPOSITION_EVICTION = 'lru'
+
+# Match server (python -m app.net.server)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 7777
+SERVER_TICK_MS = 50  # state broadcast interval; simulation steps stay SIMULATION_STEP_MS
+SERVER_WRITE_BUFFER = 64 * 1024  # per-client bytes buffered before frames are coalesced
+SERVER_MAX_LINE = 4096  # longest accepted client message (bytes)
+SERVER_MAX_ACTIONS_PER_TICK = 16  # per player; extra actions are rejected
+SPECTATOR_KEYFRAME_INTERVAL = 60  # delta frames between full spectator keyframes
 
 # Scoring
 SCORE_SINGLE = 100
@@ -53,22 +93,33 @@ SCORE_HARD_DROP = 2
 # Lines per level
 LINES_PER_LEVEL = 10
 
-# Controls - Player 1
-P1_LEFT = pygame.K_LEFT
-P1_RIGHT = pygame.K_RIGHT
-P1_DOWN = pygame.K_DOWN
-P1_ROTATE = pygame.K_UP
-P1_HARD_DROP = pygame.K_SPACE
+# Replays
+RECORD_REPLAYS = True
+REPLAY_DIR = 'replays'
+REPLAY_FLUSH_BYTES = 4096  # buffered bytes handed to the writer thread at once
+REPLAY_CHECKPOINT_INTERVAL = 600  # frames between playback seek checkpoints
 
-# Controls - Player 2
-P2_LEFT = pygame.K_a
-P2_RIGHT = pygame.K_d
-P2_DOWN = pygame.K_s
-P2_ROTATE = pygame.K_w
-P2_HARD_DROP = pygame.K_q
+# Frame profiler (enabled with --profile)
+PROFILER_CAPACITY = 3600  # frames kept in the ring buffer
+PROFILER_STATS_INTERVAL = 30  # frames between overlay refreshes
+PROFILER_OUTPUT = 'frame_profile.json'  # .json or .csv
 
 # Font sizes
 FONT_SIZE_LARGE = 48
 FONT_SIZE_MEDIUM = 32
 FONT_SIZE_SMALL = 24
+FONT_SIZE_TINY = 18  # party-mode board labels
+
+# Maximum number of rendered text surfaces kept by the text cache
+TEXT_CACHE_SIZE = 256
+
 
+def __getattr__(name):
+    """Resolve key constants from app.controls so config stays pygame-free"""
+    prefix, _, _ = name.partition('_')
+    if prefix[:1] == 'P' and prefix[1:].isdigit():
+        # Whichever players app.controls has layouts for
+        from . import controls
+        if hasattr(controls, name):
+            return getattr(controls, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,109 @@
+"""
+Keyboard controls for Tetris game
+Maps pygame keys to players and engine actions
+"""
+
+import pygame
+
+# Controls - Player 1
+P1_LEFT = pygame.K_LEFT
+P1_RIGHT = pygame.K_RIGHT
+P1_DOWN = pygame.K_DOWN
+P1_ROTATE = pygame.K_UP
+P1_HARD_DROP = pygame.K_SPACE
+P1_SOFT_DROP = pygame.K_RSHIFT
+
+# Controls - Player 2
+P2_LEFT = pygame.K_a
+P2_RIGHT = pygame.K_d
+P2_DOWN = pygame.K_s
+P2_ROTATE = pygame.K_w
+P2_HARD_DROP = pygame.K_q
+P2_SOFT_DROP = pygame.K_e
+
+# Controls - Players 3-16 (party mode; boards past the sixteenth have no
+# keys and are driven through Engine.apply_action)
+P3_LEFT = pygame.K_j
+P3_RIGHT = pygame.K_l
+P3_ROTATE = pygame.K_i
+P3_HARD_DROP = pygame.K_u
+P3_SOFT_DROP = pygame.K_k
+
+P4_LEFT = pygame.K_KP4
+P4_RIGHT = pygame.K_KP6
+P4_ROTATE = pygame.K_KP8
+P4_HARD_DROP = pygame.K_KP0
+P4_SOFT_DROP = pygame.K_KP5
+
+P5_LEFT = pygame.K_f
+P5_RIGHT = pygame.K_h
+P5_ROTATE = pygame.K_t
+P5_HARD_DROP = pygame.K_r
+P5_SOFT_DROP = pygame.K_g
+
+P6_LEFT = pygame.K_1
+P6_RIGHT = pygame.K_3
+P6_ROTATE = pygame.K_2
+P6_HARD_DROP = pygame.K_4
+P6_SOFT_DROP = pygame.K_5
+
+P7_LEFT = pygame.K_7
+P7_RIGHT = pygame.K_9
+P7_ROTATE = pygame.K_8
+P7_HARD_DROP = pygame.K_0
+P7_SOFT_DROP = pygame.K_MINUS
+
+P8_LEFT = pygame.K_b
+P8_RIGHT = pygame.K_m
+P8_ROTATE = pygame.K_n
+P8_HARD_DROP = pygame.K_v
+P8_SOFT_DROP = pygame.K_COMMA
+
+P9_LEFT = pygame.K_z
+P9_RIGHT = pygame.K_c
+P9_ROTATE = pygame.K_x
+P9_HARD_DROP = pygame.K_LSHIFT
+P9_SOFT_DROP = pygame.K_LCTRL
+
+P10_LEFT = pygame.K_SEMICOLON
+P10_RIGHT = pygame.K_QUOTE
+P10_ROTATE = pygame.K_p
+P10_HARD_DROP = pygame.K_LEFTBRACKET
+P10_SOFT_DROP = pygame.K_SLASH
+
+P11_LEFT = pygame.K_KP1
+P11_RIGHT = pygame.K_KP3
+P11_ROTATE = pygame.K_KP2
+P11_HARD_DROP = pygame.K_KP_ENTER
+P11_SOFT_DROP = pygame.K_KP_PERIOD
+
+P12_LEFT = pygame.K_KP7
+P12_RIGHT = pygame.K_KP9
+P12_ROTATE = pygame.K_KP_DIVIDE
+P12_HARD_DROP = pygame.K_KP_PLUS
+P12_SOFT_DROP = pygame.K_KP_MINUS
+
+P13_LEFT = pygame.K_DELETE
+P13_RIGHT = pygame.K_PAGEDOWN
+P13_ROTATE = pygame.K_HOME
+P13_HARD_DROP = pygame.K_INSERT
+P13_SOFT_DROP = pygame.K_END
+
+# F3 is left out: it toggles the profiler overlay
+P14_LEFT = pygame.K_F1
+P14_RIGHT = pygame.K_F2
+P14_ROTATE = pygame.K_F4
+P14_HARD_DROP = pygame.K_F5
+P14_SOFT_DROP = pygame.K_F6
+
+P15_LEFT = pygame.K_F7
+P15_RIGHT = pygame.K_F8
+P15_ROTATE = pygame.K_F9
+P15_HARD_DROP = pygame.K_F10
+P15_SOFT_DROP = pygame.K_F11
+
+P16_LEFT = pygame.K_y
+P16_RIGHT = pygame.K_o
+P16_ROTATE = pygame.K_6
+P16_HARD_DROP = pygame.K_TAB
+P16_SOFT_DROP = pygame.K_PERIOD
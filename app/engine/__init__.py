@@ -0,0 +1,16 @@
+"""
+Headless Tetris engine
+Pure game logic with no pygame dependency
+"""
+
+from .actions import (
+    NOOP,
+    MOVE_LEFT,
+    MOVE_RIGHT,
+    ROTATE,
+    HARD_DROP,
+    SOFT_DROP,
+    ACTION_NAMES,
+    apply_action,
+)
+from .core import Engine
@@ -0,0 +1,35 @@
+"""
+Player actions understood by the headless engine
+Each action maps to one Player method call
+"""
+
+NOOP = 0
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+ROTATE = 3
+HARD_DROP = 4
+SOFT_DROP = 5
+
+ACTION_NAMES = {
+    NOOP: 'noop',
+    MOVE_LEFT: 'move_left',
+    MOVE_RIGHT: 'move_right',
+    ROTATE: 'rotate',
+    HARD_DROP: 'hard_drop',
+    SOFT_DROP: 'soft_drop',
+}
+
+
+def apply_action(player, action):
+    """Apply an action to a player, returning the Player method's result"""
+    if action == MOVE_LEFT:
+        return player.move(-1, 0)
+    elif action == MOVE_RIGHT:
+        return player.move(1, 0)
+    elif action == ROTATE:
+        return player.rotate_piece()
+    elif action == HARD_DROP:
+        return player.hard_drop()
+    elif action == SOFT_DROP:
+        return player.move(0, 1)
+    return None
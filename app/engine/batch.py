@@ -0,0 +1,227 @@
+"""
+NumPy-vectorized batch simulator
+Steps many independent single-player boards with the same rules as Player
+"""
+
+import numpy as np
+
+from ..config import (
+    BOARD_WIDTH,
+    BOARD_HEIGHT,
+    SCORE_SINGLE,
+    LINES_PER_LEVEL,
+    INITIAL_FALL_SPEED,
+    LEVEL_SPEED_REDUCTION,
+    MIN_FALL_SPEED,
+    MAX_GRAVITY_ROWS,
+    RANDOMIZER_MODE,
+)
+from ..player import WALL_KICKS
+from ..randomizer import Randomizer, PIECE_ORDER
+from ..tetromino import SHAPE_TABLES
+from .actions import MOVE_LEFT, MOVE_RIGHT, ROTATE, HARD_DROP, SOFT_DROP
+
+SHAPE_ORDER = list(PIECE_ORDER)
+SHAPE_INDEX = {shape_type: i for i, shape_type in enumerate(SHAPE_ORDER)}
+
+# Block offsets as (shape, rotation, block) arrays; rotations pad by repetition
+_MAX_ROTATIONS = max(len(SHAPE_TABLES[s]) for s in SHAPE_ORDER)
+NUM_ROTATIONS = np.array([len(SHAPE_TABLES[s]) for s in SHAPE_ORDER], dtype=np.int64)
+BLOCK_X = np.array([
+    [[bx for bx, _ in SHAPE_TABLES[s][r % len(SHAPE_TABLES[s])].blocks] for r in range(_MAX_ROTATIONS)]
+    for s in SHAPE_ORDER
+], dtype=np.int64)
+BLOCK_Y = np.array([
+    [[by for _, by in SHAPE_TABLES[s][r % len(SHAPE_TABLES[s])].blocks] for r in range(_MAX_ROTATIONS)]
+    for s in SHAPE_ORDER
+], dtype=np.int64)
+
+
+class BatchEngine:
+    """N single-player boards held as one (N, height, width) array"""
+    
+    def __init__(self, num_boards, seeds=None, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 randomizer_mode=RANDOMIZER_MODE):
+        if seeds is None:
+            seeds = [None] * num_boards
+        if len(seeds) != num_boards:
+            raise ValueError("seeds must have one entry per board")
+        
+        self.num_boards = num_boards
+        self.board_width = board_width
+        self.board_height = board_height
+        
+        # Cells hold SHAPE_ORDER index + 1 (0 = empty)
+        self.boards = np.zeros((num_boards, board_height, board_width), dtype=np.uint8)
+        self.piece_shape = np.zeros(num_boards, dtype=np.int64)
+        self.piece_rotation = np.zeros(num_boards, dtype=np.int64)
+        self.piece_x = np.zeros(num_boards, dtype=np.int64)
+        self.piece_y = np.zeros(num_boards, dtype=np.int64)
+        self.next_shape = np.zeros(num_boards, dtype=np.int64)
+        
+        self.score = np.zeros(num_boards, dtype=np.int64)
+        self.level = np.ones(num_boards, dtype=np.int64)
+        self.lines_cleared = np.zeros(num_boards, dtype=np.int64)
+        self.fall_time = np.zeros(num_boards, dtype=np.int64)
+        self.fall_speed = np.full(num_boards, INITIAL_FALL_SPEED, dtype=np.int64)
+        self.game_over = np.zeros(num_boards, dtype=bool)
+        
+        # Same randomizers Player uses, so seeded sequences match
+        self._randomizers = [Randomizer(seed, randomizer_mode) for seed in seeds]
+        self._index = np.arange(num_boards)
+        
+        # Initialize with first pieces, like Player.__init__
+        for i, randomizer in enumerate(self._randomizers):
+            self.next_shape[i] = SHAPE_INDEX[randomizer.next()]
+        self._spawn(np.ones(num_boards, dtype=bool))
+    
+    def _collides(self, rotation, x, y):
+        """Check every board's current piece at the given rotation/position"""
+        bx = BLOCK_X[self.piece_shape, rotation] + x[:, None]
+        by = BLOCK_Y[self.piece_shape, rotation] + y[:, None]
+        
+        outside = (bx < 0) | (bx >= self.board_width) | (by >= self.board_height)
+        cells = self.boards[
+            self._index[:, None],
+            np.clip(by, 0, self.board_height - 1),
+            np.clip(bx, 0, self.board_width - 1)
+        ]
+        placed = ~outside & (by >= 0) & (cells != 0)
+        return (outside | placed).any(axis=1)
+    
+    def _move(self, mask, dx, dy):
+        """Move pieces on masked boards where the move is free"""
+        ok = mask & ~self._collides(self.piece_rotation, self.piece_x + dx, self.piece_y + dy)
+        self.piece_x[ok] += dx
+        self.piece_y[ok] += dy
+        return ok
+    
+    def _rotate(self, mask):
+        """Rotate pieces on masked boards, trying the same wall kicks as Player"""
+        rotated = (self.piece_rotation + 1) % NUM_ROTATIONS[self.piece_shape]
+        pending = mask & self._collides(rotated, self.piece_x, self.piece_y)
+        done = mask & ~pending
+        
+        for dx in WALL_KICKS:
+            if not pending.any():
+                break
+            kicked = pending & ~self._collides(rotated, self.piece_x + dx, self.piece_y)
+            self.piece_x[kicked] += dx
+            done |= kicked
+            pending &= ~kicked
+        
+        self.piece_rotation[done] = rotated[done]
+        return done
+    
+    def _hard_drop(self, mask):
+        """Drop masked pieces to the bottom and lock them"""
+        falling = mask.copy()
+        while falling.any():
+            falling = self._move(falling, 0, 1)
+        self._lock(mask)
+    
+    def _lock(self, mask):
+        """Lock masked pieces, clear lines, score and spawn the next piece"""
+        boards = np.flatnonzero(mask)
+        if len(boards) == 0:
+            return
+        
+        shape = self.piece_shape[boards]
+        rotation = self.piece_rotation[boards]
+        bx = BLOCK_X[shape, rotation] + self.piece_x[boards, None]
+        by = BLOCK_Y[shape, rotation] + self.piece_y[boards, None]
+        inside = (by >= 0) & (by < self.board_height) & (bx >= 0) & (bx < self.board_width)
+        owner = np.broadcast_to(boards[:, None], bx.shape)
+        self.boards[owner[inside], by[inside], bx[inside]] = np.broadcast_to(
+            (shape + 1)[:, None], bx.shape
+        )[inside].astype(np.uint8)
+        
+        self._clear_lines(boards)
+        self._spawn(mask)
+    
+    def _clear_lines(self, boards):
+        """Clear full rows on the given boards and update score and level"""
+        full = (self.boards[boards] != 0).all(axis=2)
+        counts = full.sum(axis=1)
+        cleared = counts > 0
+        if not cleared.any():
+            return
+        
+        boards = boards[cleared]
+        full = full[cleared]
+        counts = counts[cleared]
+        
+        # Stable sort puts full rows on top, keeping the others in order,
+        # then the rows that moved to the top are emptied
+        order = np.argsort(~full, axis=1, kind='stable')
+        compacted = np.take_along_axis(self.boards[boards], order[:, :, None], axis=1)
+        rows = np.arange(self.board_height)
+        compacted[rows[None, :] < counts[:, None]] = 0
+        self.boards[boards] = compacted
+        
+        # Same scoring and level rules as Player._update_score/_update_level
+        self.score[boards] += SCORE_SINGLE * counts * self.level[boards]
+        self.lines_cleared[boards] += counts
+        new_level = self.lines_cleared[boards] // LINES_PER_LEVEL + 1
+        raised = new_level > self.level[boards]
+        raised_boards = boards[raised]
+        self.level[raised_boards] = new_level[raised]
+        self.fall_speed[raised_boards] = np.maximum(
+            INITIAL_FALL_SPEED - (self.level[raised_boards] - 1) * LEVEL_SPEED_REDUCTION,
+            MIN_FALL_SPEED
+        )
+    
+    def _spawn(self, mask):
+        """Promote next pieces on masked boards and draw new ones"""
+        boards = np.flatnonzero(mask)
+        self.piece_shape[boards] = self.next_shape[boards]
+        self.piece_rotation[boards] = 0
+        self.piece_x[boards] = self.board_width // 2 - 2
+        self.piece_y[boards] = 0
+        for i in boards:
+            self.next_shape[i] = SHAPE_INDEX[self._randomizers[i].next()]
+        
+        # Check for game over
+        self.game_over |= mask & self._collides(self.piece_rotation, self.piece_x, self.piece_y)
+    
+    def apply_actions(self, actions):
+        """Apply one action per board (an array of action ids)"""
+        actions = np.asarray(actions)
+        active = ~self.game_over
+        
+        self._move(active & (actions == MOVE_LEFT), -1, 0)
+        self._move(active & (actions == MOVE_RIGHT), 1, 0)
+        self._move(active & (actions == SOFT_DROP), 0, 1)
+        self._rotate(active & (actions == ROTATE))
+        self._hard_drop(active & (actions == HARD_DROP))
+    
+    def update(self, dt):
+        """Advance gravity on every board by dt milliseconds"""
+        self.fall_time[~self.game_over] += dt
+        
+        # Same carry-over and MAX_GRAVITY_ROWS cap as Player.update
+        for _ in range(MAX_GRAVITY_ROWS):
+            fire = ~self.game_over & (self.fall_time >= self.fall_speed)
+            if not fire.any():
+                return
+            self.fall_time[fire] -= self.fall_speed[fire]
+            landed = fire & ~self._move(fire, 0, 1)
+            self.fall_time[landed] = 0
+            self._lock(landed)
+        
+        behind = ~self.game_over & (self.fall_time >= self.fall_speed)
+        self.fall_time[behind] %= self.fall_speed[behind]
+    
+    def step(self, actions, dt):
+        """Apply one action per board, then advance gravity by dt milliseconds"""
+        self.apply_actions(actions)
+        self.update(dt)
+    
+    def results(self):
+        """Get per-board (score, level, lines_cleared, game_over) arrays"""
+        return (
+            self.score.copy(),
+            self.level.copy(),
+            self.lines_cleared.copy(),
+            self.game_over.copy(),
+        )
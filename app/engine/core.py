@@ -0,0 +1,102 @@
+"""
+Headless game engine for Tetris
+Runs players from explicit actions and ticks without importing pygame
+"""
+
+from ..config import BOARD_WIDTH, BOARD_HEIGHT
+from ..player import Player
+from .actions import apply_action
+
+
+class Engine:
+    """Game state for one match, driven by actions and ticks"""
+    
+    def __init__(self, num_players=1, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT, seed=None):
+        self.num_players = num_players
+        self.board_width = board_width
+        self.board_height = board_height
+        self.seed = seed
+        self.players = []
+        self.running = True
+        self.frame = 0
+        # Optional app.replay.ReplayRecorder fed by apply_action and update
+        self.recorder = None
+        
+        # Initialize players (a shared seed gives every player the same pieces)
+        for i in range(num_players):
+            player = Player(i + 1, board_width, board_height, seed=seed)
+            self.players.append(player)
+    
+    def reset(self, seed=None):
+        """Start a new match on the same engine and players"""
+        self.seed = seed
+        self.running = True
+        self.frame = 0
+        for player in self.players:
+            player.reset(seed)
+    
+    def apply_action(self, player_index, action):
+        """Apply an action to the player at player_index"""
+        if self.recorder is not None:
+            self.recorder.record_action(player_index, action)
+        return apply_action(self.players[player_index], action)
+    
+    def update(self, dt):
+        """Update game state"""
+        self.advance(dt, 1)
+    
+    def advance(self, dt, steps):
+        """Run up to steps updates of dt ms, stopping once the match ends
+        
+        Returns the number of steps run. Batching the steps of a frame keeps
+        the per-step overhead low when many boards are playing.
+        """
+        players = self.players
+        updates = [player.update for player in players]
+        recorder = self.recorder
+        for step in range(steps):
+            if recorder is not None:
+                recorder.record_tick(dt)
+            for update in updates:
+                update(dt)
+            self.frame += 1
+            
+            # Check if game should end
+            if any(player.game_over for player in players):
+                self.running = False
+                return step + 1
+        return steps
+    
+    def tick(self, dt, actions=()):
+        """Apply (player_index, action) pairs, then advance the game by dt ms"""
+        for player_index, action in actions:
+            self.apply_action(player_index, action)
+        self.update(dt)
+    
+    def start_recording(self, path=None):
+        """Record this match as a replay (to path, or in memory if None)"""
+        from ..replay import ReplayRecorder
+        self.recorder = ReplayRecorder(self, path)
+        return self.recorder
+    
+    def stop_recording(self):
+        """Finish the current replay and return its recorder (its file may
+        still be being written; see ReplayRecorder.wait)"""
+        recorder = self.recorder
+        self.recorder = None
+        if recorder is not None:
+            recorder.close()
+        return recorder
+    
+    def is_game_over(self):
+        """Check if game is over"""
+        return not self.running or any(player.game_over for player in self.players)
+    
+    def get_ranking(self):
+        """Get current ranking of players by score"""
+        ranked_players = sorted(
+            self.players,
+            key=lambda p: p.score,
+            reverse=True
+        )
+        return ranked_players
@@ -0,0 +1,132 @@
+"""
+Reachability-aware move generation
+Breadth-first search over (rotation, x, y) piece states using the engine's
+own move and rotate rules, so tucks and spins under overhangs are found
+"""
+
+from collections import deque
+from functools import lru_cache
+
+from .actions import MOVE_LEFT, MOVE_RIGHT, ROTATE, SOFT_DROP, HARD_DROP
+from .search import Placements, collides, drop_row, rotate, _shifted_masks
+
+# Boards whose move graphs are kept between calls
+MOVEGEN_CACHE_SIZE = 64
+
+
+class MoveGenerator:
+    """Move graph of one piece type on one board, built lazily
+    
+    Neighbor transitions are memoized per state, so repeated searches on the
+    same board (e.g. replanning every tick) only pay for new states.
+    """
+    
+    def __init__(self, rows, width, shape_type):
+        self.rows = rows
+        self.width = width
+        self.shape_type = shape_type
+        self._neighbors = {}
+    
+    def neighbors(self, state):
+        """Get (action, next_state) pairs for every action that moves the piece"""
+        cached = self._neighbors.get(state)
+        if cached is not None:
+            return cached
+        
+        rotation, x, y = state
+        rows = self.rows
+        width = self.width
+        shape_type = self.shape_type
+        result = []
+        if not collides(rows, width, shape_type, rotation, x - 1, y):
+            result.append((MOVE_LEFT, (rotation, x - 1, y)))
+        if not collides(rows, width, shape_type, rotation, x + 1, y):
+            result.append((MOVE_RIGHT, (rotation, x + 1, y)))
+        rotated = rotate(rows, width, shape_type, rotation, x, y)
+        if rotated is not None:
+            result.append((ROTATE, (rotated[0], rotated[1], y)))
+        if not collides(rows, width, shape_type, rotation, x, y + 1):
+            result.append((SOFT_DROP, (rotation, x, y + 1)))
+        
+        result = tuple(result)
+        self._neighbors[state] = result
+        return result
+    
+    def landing(self, state):
+        """Get the state a hard drop from state locks in"""
+        rotation, x, y = state
+        return rotation, x, drop_row(self.rows, self.width, self.shape_type, rotation, x, y)
+    
+    def search(self, start):
+        """Breadth-first search from start
+        
+        Returns {final_state: state it is hard-dropped from} for the nearest
+        such state, and the parent links {state: (action, previous_state)}.
+        """
+        parents = {start: None}
+        finals = {}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            final = self.landing(state)
+            if final not in finals:
+                finals[final] = state
+            for action, following in self.neighbors(state):
+                if following not in parents:
+                    parents[following] = (action, state)
+                    queue.append(following)
+        return finals, parents
+    
+    def route(self, parents, state, final):
+        """Get the (action, state after it) steps from the start to final"""
+        steps = [(HARD_DROP, final)]
+        while parents[state] is not None:
+            action, previous = parents[state]
+            steps.append((action, state))
+            state = previous
+        steps.reverse()
+        return steps
+
+
+@lru_cache(maxsize=MOVEGEN_CACHE_SIZE)
+def move_generator(rows, width, shape_type):
+    """Get the shared MoveGenerator for a board (rows as a tuple)"""
+    return MoveGenerator(rows, width, shape_type)
+
+
+def reachable_placements(rows, width, shape_type, rotation, x, y):
+    """Get every reachable final placement and the shortest route to each
+    
+    Returns (placements, routes) where routes[i] is a tuple of
+    (action, state after it) steps ending in HARD_DROP. Placements that
+    leave the same cells filled are listed once, with the shortest route.
+    """
+    generator = move_generator(tuple(rows), width, shape_type)
+    finals, parents = generator.search((rotation, x, y))
+    
+    # Shortest routes first, so duplicates keep the shortest one
+    ordered = sorted(
+        (generator.route(parents, state, final) for final, state in finals.items()),
+        key=len
+    )
+    
+    placements = Placements(shape_type)
+    routes = []
+    seen = set()
+    for steps in ordered:
+        final_rotation, final_x, final_y = steps[-1][1]
+        cells = tuple(
+            (final_y + by, mask)
+            for by, mask in _shifted_masks(shape_type, final_rotation, final_x)
+        )
+        if cells in seen:
+            continue
+        seen.add(cells)
+        placements.append(final_rotation, final_x, final_y, 0)
+        routes.append(tuple(steps))
+    return placements, routes
+
+
+def route_actions(route):
+    """Get just the action ids of a route"""
+    return [action for action, _ in route]
@@ -0,0 +1,366 @@
+"""
+Placement search for AI agents
+Enumerates every final placement of a piece on a row-bitmask copy of the board
+and scores them with a pluggable evaluation function
+"""
+
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+from ..player import WALL_KICKS
+from ..tetromino import SHAPE_TABLES
+from ..zobrist import cell_keys, lines_key, rows_hash
+from .actions import MOVE_LEFT, MOVE_RIGHT, ROTATE, HARD_DROP
+
+# Score given to placements that leave no room to spawn the next piece
+TOP_OUT = float('-inf')
+
+# lines_key for every line count two placements can clear
+_LINES_KEYS = tuple(lines_key(lines) for lines in range(9))
+
+Placement = namedtuple('Placement', ['rotation', 'x', 'y', 'lines', 'score'])
+
+
+class Placements:
+    """Placements of one piece held as parallel compact arrays"""
+    
+    __slots__ = ('shape_type', 'rotation', 'x', 'y', 'lines', 'score', 'routes')
+    
+    def __init__(self, shape_type):
+        self.shape_type = shape_type
+        # Per-placement (action, state) routes, when found by app.engine.movegen
+        self.routes = None
+        self.rotation = array('b')
+        # 16-bit, so boards taller or wider than 127 cells still fit
+        self.x = array('h')
+        self.y = array('h')
+        self.lines = array('B')
+        self.score = array('d')
+    
+    def __len__(self):
+        return len(self.rotation)
+    
+    def __getitem__(self, i):
+        return Placement(self.rotation[i], self.x[i], self.y[i], self.lines[i], self.score[i])
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def append(self, rotation, x, y, lines, score=0.0):
+        self.rotation.append(rotation)
+        self.x.append(x)
+        self.y.append(y)
+        self.lines.append(lines)
+        self.score.append(score)
+    
+    def best_index(self):
+        """Get the index of the highest scoring placement (first on ties), or None"""
+        if not len(self):
+            return None
+        score = self.score
+        return max(range(len(score)), key=score.__getitem__)
+    
+    def best(self):
+        """Get the highest scoring placement, or None"""
+        index = self.best_index()
+        return None if index is None else self[index]
+
+
+def board_rows(player):
+    """Get a player's locked cells as a list of row bitmasks (bit x = column x)"""
+    if player.use_bitboard:
+        return list(player.board.rows)
+    return [
+        sum(1 << x for x, cell in enumerate(row) if cell != 0)
+        for row in player.board
+    ]
+
+
+@lru_cache(maxsize=None)
+def _shifted_masks(shape_type, rotation, x):
+    """(row offset, row mask) pairs of a rotation placed at column x"""
+    return tuple(
+        (by, mask << x if x >= 0 else mask >> -x)
+        for by, mask in SHAPE_TABLES[shape_type][rotation].row_masks
+    )
+
+
+def collides(rows, width, shape_type, rotation, x, y):
+    """Same test as Player._check_collision, on a row-bitmask board"""
+    table = SHAPE_TABLES[shape_type][rotation]
+    if x + table.min_x < 0 or x + table.max_x >= width:
+        return True
+    height = len(rows)
+    for by, mask in _shifted_masks(shape_type, rotation, x):
+        row = y + by
+        if row >= height:
+            return True
+        if row >= 0 and rows[row] & mask:
+            return True
+    return False
+
+
+def drop_row(rows, width, shape_type, rotation, x, y):
+    """Get the row a piece at (x, y) lands on when dropped"""
+    while not collides(rows, width, shape_type, rotation, x, y + 1):
+        y += 1
+    return y
+
+
+def rotate(rows, width, shape_type, rotation, x, y):
+    """Rotate clockwise with Player.rotate_piece's kicks; (rotation, x) or None"""
+    rotation = (rotation + 1) % len(SHAPE_TABLES[shape_type])
+    if not collides(rows, width, shape_type, rotation, x, y):
+        return rotation, x
+    for dx in WALL_KICKS:
+        if not collides(rows, width, shape_type, rotation, x + dx, y):
+            return rotation, x + dx
+    return None
+
+
+def place(rows, width, shape_type, rotation, x, y):
+    """Lock a piece into a copy of rows and clear lines; returns (rows, lines)"""
+    new_rows = list(rows)
+    for by, mask in _shifted_masks(shape_type, rotation, x):
+        if y + by >= 0:
+            new_rows[y + by] |= mask
+    
+    full_row = (1 << width) - 1
+    kept = [row for row in new_rows if row != full_row]
+    lines = len(new_rows) - len(kept)
+    if lines:
+        new_rows = [0] * lines + kept
+    return new_rows, lines
+
+
+def evaluate_board(rows, width, lines):
+    """Default evaluation: reward lines, punish height, holes and bumpiness"""
+    height = len(rows)
+    heights = [0] * width
+    covered = 0
+    holes = 0
+    for y, row in enumerate(rows):
+        holes += bin(covered & ~row).count('1')
+        tops = row & ~covered
+        while tops:
+            low = tops & -tops
+            heights[low.bit_length() - 1] = height - y
+            tops ^= low
+        covered |= row
+    
+    bumpiness = sum(abs(heights[x + 1] - heights[x]) for x in range(width - 1))
+    return 0.76 * lines - 0.51 * sum(heights) - 0.36 * holes - 0.18 * bumpiness
+
+
+def legal_placements(rows, width, shape_type, rotation, x, y):
+    """Get every distinct final placement from a starting piece state
+    
+    The piece may rotate in place (with kicks), then shift sideways, then
+    drop straight down, exactly as the engine's actions allow. Placements
+    that leave the same cells filled are only listed once.
+    """
+    placements = Placements(shape_type)
+    seen = set()
+    start = (rotation, x)
+    
+    for _ in range(len(SHAPE_TABLES[shape_type])):
+        rotation, x = start
+        columns = [x]
+        for step in (-1, 1):
+            column = x + step
+            while not collides(rows, width, shape_type, rotation, column, y):
+                columns.append(column)
+                column += step
+        
+        for column in columns:
+            landing = drop_row(rows, width, shape_type, rotation, column, y)
+            cells = tuple(
+                (landing + by, mask)
+                for by, mask in _shifted_masks(shape_type, rotation, column)
+            )
+            if cells not in seen:
+                seen.add(cells)
+                placements.append(rotation, column, landing, 0)
+        
+        start = rotate(rows, width, shape_type, rotation, x, y)
+        if start is None:
+            break
+    return placements
+
+
+def search(player, evaluate=evaluate_board, lookahead=True, tucks=False, table=None):
+    """Score every legal placement of the player's current piece
+    
+    evaluate(rows, width, lines) scores a board after a placement. With
+    lookahead, each placement is scored by the best follow-up placement of
+    next_piece (2-ply). With tucks, the current piece's placements come from
+    the full move search (see app.engine.movegen) and carry their routes.
+    
+    table is an optional app.engine.transposition.TranspositionTable that
+    memoizes the 2-ply leaf evaluations by Zobrist hash: the same board is
+    often reached by placing the two pieces in different spots (always when
+    they have the same shape). Use one table per evaluate.
+    """
+    piece = player.current_piece
+    width = player.board_width
+    rows = board_rows(player)
+    if tucks:
+        from .movegen import reachable_placements
+        placements, routes = reachable_placements(
+            rows, width, piece.shape_type, piece.rotation_index, piece.x, piece.y
+        )
+        placements.routes = routes
+    else:
+        placements = legal_placements(
+            rows, width, piece.shape_type, piece.rotation_index, piece.x, piece.y
+        )
+    
+    next_type = player.next_piece.shape_type if lookahead and player.next_piece else None
+    spawn_x = width // 2 - 2
+    keys = None
+    if table is not None and next_type is not None:
+        keys = cell_keys(width, player.board_height)
+    for i in range(len(placements)):
+        rotation, x, y = placements.rotation[i], placements.x[i], placements.y[i]
+        after, lines = place(rows, width, piece.shape_type, rotation, x, y)
+        placements.lines[i] = lines
+        
+        if next_type is None:
+            placements.score[i] = evaluate(after, width, lines)
+        elif collides(after, width, next_type, 0, spawn_x, 0):
+            placements.score[i] = TOP_OUT
+        elif keys is None:
+            placements.score[i] = _best_follow_up(after, width, next_type, spawn_x, lines, evaluate)
+        else:
+            after_hash = _placed_hash(player.board_hash, after, width, keys, piece.shape_type, rotation, x, y, lines)
+            placements.score[i] = _best_follow_up(
+                after, width, next_type, spawn_x, lines, evaluate, table, keys, after_hash
+            )
+    return placements
+
+
+def _placed_hash(board_hash, after, width, keys, shape_type, rotation, x, y, lines):
+    """Zobrist hash of the board after a placement, given the hash before it"""
+    if lines:
+        return rows_hash(after, width)
+    # Without a clear, only the piece's own cells were added
+    for bx, by in SHAPE_TABLES[shape_type][rotation].blocks:
+        if y + by >= 0:
+            board_hash ^= keys[y + by][x + bx]
+    return board_hash
+
+
+def _best_follow_up(rows, width, shape_type, spawn_x, lines, evaluate,
+                    table=None, keys=None, rows_key=0):
+    """Best score over every placement of a freshly spawned piece
+    
+    With a table, each resulting board's evaluation is looked up by its
+    Zobrist hash (rows_key is the hash of rows) and line count first.
+    """
+    best = TOP_OUT
+    follow_ups = legal_placements(rows, width, shape_type, 0, spawn_x, 0)
+    if table is not None:
+        blocks = [rotation_table.blocks for rotation_table in SHAPE_TABLES[shape_type]]
+        get, put = table.get, table.put
+    for j in range(len(follow_ups)):
+        rotation, x, y = follow_ups.rotation[j], follow_ups.x[j], follow_ups.y[j]
+        final, more = place(rows, width, shape_type, rotation, x, y)
+        if table is None:
+            score = evaluate(final, width, lines + more)
+        else:
+            if more:
+                key = rows_hash(final, width)
+            else:
+                key = rows_key
+                for bx, by in blocks[rotation]:
+                    if y + by >= 0:
+                        key ^= keys[y + by][x + bx]
+            key ^= _LINES_KEYS[lines + more]
+            score = get(key)
+            if score is None:
+                score = evaluate(final, width, lines + more)
+                put(key, score)
+        if score > best:
+            best = score
+    return best
+
+
+def placement_actions(player, placement):
+    """Get the actions that move the current piece to a placement and drop it"""
+    piece = player.current_piece
+    rows = board_rows(player)
+    width = player.board_width
+    rotation, x = piece.rotation_index, piece.x
+    
+    actions = []
+    while rotation != placement.rotation:
+        rotated = rotate(rows, width, piece.shape_type, rotation, x, piece.y)
+        if rotated is None:
+            raise ValueError("placement is not reachable by rotating in place")
+        rotation, x = rotated
+        actions.append(ROTATE)
+    
+    step = MOVE_RIGHT if placement.x > x else MOVE_LEFT
+    actions.extend([step] * abs(placement.x - x))
+    actions.append(HARD_DROP)
+    return actions
+
+
+class SearchAgent:
+    """Agent that plays the best searched placement, one action per tick
+    
+    With tucks, it follows full move-search routes, and finds a new route
+    to the same placement whenever gravity moves the piece off the planned
+    one.
+    """
+    
+    def __init__(self, evaluate=evaluate_board, lookahead=True, tucks=False, table=None):
+        self.evaluate = evaluate
+        self.lookahead = lookahead
+        self.tucks = tucks
+        self.table = table
+        self._piece = None
+        self._target = None
+        self._steps = []
+        self._expected = None
+    
+    def _plan(self, player):
+        """Search and queue the (action, expected state) steps for the best placement"""
+        placements = search(player, self.evaluate, self.lookahead, self.tucks, self.table)
+        index = placements.best_index()
+        if index is None:
+            self._steps = []
+        elif self.tucks:
+            self._target = placements[index][:3]
+            self._steps = list(placements.routes[index])
+        else:
+            self._steps = [(action, None) for action in placement_actions(player, placements[index])]
+    
+    def _reroute(self, player):
+        """Route to the planned placement again from where the piece is now"""
+        from .movegen import reachable_placements
+        piece = player.current_piece
+        placements, routes = reachable_placements(
+            board_rows(player), player.board_width,
+            piece.shape_type, piece.rotation_index, piece.x, piece.y
+        )
+        for i in range(len(placements)):
+            if placements[i][:3] == self._target:
+                self._steps = list(routes[i])
+                return
+        self._plan(player)
+    
+    def __call__(self, player):
+        piece = player.current_piece
+        if piece is not self._piece:
+            self._piece = piece
+            self._plan(player)
+        elif self._expected is not None and self._expected != (piece.rotation_index, piece.x, piece.y):
+            self._reroute(player)
+        if not self._steps:
+            self._expected = None
+            return HARD_DROP
+        action, self._expected = self._steps.pop(0)
+        return action
@@ -0,0 +1,186 @@
+"""
+Multi-core tournament runner for bot matches
+Plays full headless games for agents over a list of seeds on a process pool
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import time
+
+from .actions import HARD_DROP
+from .core import Engine
+
+# Per-worker state, set up once by _init_worker
+_worker_agents = None
+_worker_settings = None
+_worker_engines = {}
+
+
+def hard_drop_agent(player):
+    """Baseline agent that drops every piece where it spawns"""
+    return HARD_DROP
+
+
+def play_game(engine, agents, seed, dt=16, max_ticks=100000):
+    """Play one full game on engine and return its result record
+    
+    Agents are called as agent(player) once per tick and return an action id.
+    They must be deterministic in the player state for results to be
+    reproducible.
+    """
+    engine.reset(seed)
+    started = time.perf_counter()
+    
+    while not engine.is_game_over() and engine.frame < max_ticks:
+        actions = [
+            (i, agent(player))
+            for i, (agent, player) in enumerate(zip(agents, engine.players))
+            if not player.game_over
+        ]
+        engine.tick(dt, actions)
+    
+    return {
+        'seed': seed,
+        'scores': [player.score for player in engine.players],
+        'lines': [player.lines_cleared for player in engine.players],
+        'levels': [player.level for player in engine.players],
+        'ticks': engine.frame,
+        'game_ms': engine.frame * dt,
+        'wall_seconds': time.perf_counter() - started,
+    }
+
+
+def _init_worker(agents, settings):
+    """Receive agents and settings once per worker process"""
+    global _worker_agents, _worker_settings, _worker_engines
+    _worker_agents = agents
+    _worker_settings = settings
+    _worker_engines = {}
+
+
+def _run_task(task):
+    """Play one (task_index, agent_names, seed) task, reusing the worker's engine"""
+    task_index, names, seed = task
+    engine = _worker_engines.get(len(names))
+    if engine is None:
+        engine = Engine(num_players=len(names))
+        _worker_engines[len(names)] = engine
+    
+    agents = [_worker_agents[name] for name in names]
+    result = play_game(
+        engine,
+        agents,
+        seed,
+        dt=_worker_settings['dt'],
+        max_ticks=_worker_settings['max_ticks']
+    )
+    result['index'] = task_index
+    result['agents'] = list(names)
+    return result
+
+
+def _make_tasks(names, seeds, num_players):
+    """Build the task list: every agent (or pairing) plays every seed"""
+    if num_players == 1:
+        lineups = [(name,) for name in names]
+    else:
+        lineups = list(itertools.permutations(names, num_players))
+    
+    tasks = []
+    for seed in seeds:
+        for lineup in lineups:
+            tasks.append((len(tasks), lineup, seed))
+    return tasks
+
+
+def _aggregate(games, names):
+    """Sum per-agent stats over all game records"""
+    stats = {
+        name: {
+            'games': 0,
+            'wins': 0,
+            'total_score': 0,
+            'total_lines': 0,
+            'max_level': 0,
+            'total_game_ms': 0,
+        }
+        for name in names
+    }
+    
+    for game in games:
+        best = max(game['scores'])
+        winners = [i for i, score in enumerate(game['scores']) if score == best]
+        for i, name in enumerate(game['agents']):
+            entry = stats[name]
+            entry['games'] += 1
+            entry['total_score'] += game['scores'][i]
+            entry['total_lines'] += game['lines'][i]
+            entry['max_level'] = max(entry['max_level'], game['levels'][i])
+            entry['total_game_ms'] += game['game_ms']
+            if len(game['agents']) > 1 and winners == [i]:
+                entry['wins'] += 1
+    
+    for entry in stats.values():
+        games_played = max(entry['games'], 1)
+        entry['mean_score'] = entry['total_score'] / games_played
+        entry['mean_lines'] = entry['total_lines'] / games_played
+        entry['mean_game_ms'] = entry['total_game_ms'] / games_played
+    return stats
+
+
+def run_tournament(agents, seeds, num_players=1, dt=16, max_ticks=100000,
+                   processes=None, chunksize=None):
+    """Play every agent (or every ordered pairing for 2+ players) on every seed
+    
+    agents is a dict of name -> picklable callable. Results are returned in
+    task order, so they are identical for the same seeds whatever the
+    number of worker processes.
+    """
+    names = list(agents)
+    if num_players > 1 and len(names) < num_players:
+        raise ValueError(f"need at least {num_players} agents for {num_players}-player matches")
+    
+    tasks = _make_tasks(names, seeds, num_players)
+    settings = {'dt': dt, 'max_ticks': max_ticks}
+    started = time.perf_counter()
+    
+    if processes == 1:
+        _init_worker(agents, settings)
+        games = [_run_task(task) for task in tasks]
+    else:
+        processes = processes or multiprocessing.cpu_count()
+        if chunksize is None:
+            chunksize = max(1, len(tasks) // (processes * 4))
+        with multiprocessing.Pool(processes, _init_worker, (agents, settings)) as pool:
+            games = list(pool.imap(_run_task, tasks, chunksize))
+    
+    return {
+        'games': games,
+        'agents': _aggregate(games, names),
+        'wall_seconds': time.perf_counter() - started,
+    }
+
+
+def main():
+    """Run the baseline agent over a range of seeds and print a summary"""
+    parser = argparse.ArgumentParser(description="Run headless Tetris bot matches")
+    parser.add_argument('--games', type=int, default=100, help="number of seeds to play")
+    parser.add_argument('--players', type=int, default=1, choices=[1, 2])
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+    
+    agents = {'hard_drop': hard_drop_agent}
+    if args.players == 2:
+        agents['hard_drop_2'] = hard_drop_agent
+    
+    result = run_tournament(agents, range(args.games), num_players=args.players,
+                            processes=args.processes)
+    for name, entry in result['agents'].items():
+        print(f"{name}: {entry['games']} games, mean score {entry['mean_score']:.1f}, "
+              f"mean lines {entry['mean_lines']:.1f}, wins {entry['wins']}")
+    print(f"{len(result['games'])} games in {result['wall_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
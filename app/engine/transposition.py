@@ -0,0 +1,97 @@
+"""
+Transposition table for AI search
+Bounded cache of search results keyed by Zobrist hash, with hit-rate stats
+"""
+
+from collections import OrderedDict
+from ..config import TRANSPOSITION_TABLE_SIZE, TRANSPOSITION_EVICTION
+
+
+class TranspositionTable:
+    """Bounded map from Zobrist hash to a search result
+    
+    eviction 'lru' drops the least recently used entry when full. 'depth'
+    gives every key one slot (key % capacity) and only overwrites a slot
+    with a result searched at least as deep, like a chess engine's table.
+    A stored result is only returned for lookups at the same or a lower
+    depth.
+    """
+    
+    def __init__(self, capacity=TRANSPOSITION_TABLE_SIZE, eviction=TRANSPOSITION_EVICTION):
+        if eviction not in ('lru', 'depth'):
+            raise ValueError(f"unknown eviction policy: {eviction!r}")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.eviction = eviction
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.clear()
+    
+    def clear(self):
+        """Drop every entry (stats are kept)"""
+        if self.eviction == 'lru':
+            self._entries = OrderedDict()
+        else:
+            self._slots = [None] * self.capacity
+            self._size = 0
+    
+    def __len__(self):
+        if self.eviction == 'lru':
+            return len(self._entries)
+        return self._size
+    
+    def get(self, key, depth=0):
+        """Get the result stored for key at depth or deeper, or None"""
+        if self.eviction == 'lru':
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= depth:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        else:
+            entry = self._slots[key % self.capacity]
+            if entry is not None and entry[0] == key and entry[1] >= depth:
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        return None
+    
+    def put(self, key, value, depth=0):
+        """Store a result (not None) for key, searched to depth"""
+        self.stores += 1
+        if self.eviction == 'lru':
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+            elif len(entries) >= self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            entries[key] = (depth, value)
+            return
+        
+        index = key % self.capacity
+        entry = self._slots[index]
+        if entry is None:
+            self._size += 1
+        elif entry[0] != key:
+            if entry[1] > depth:
+                # Keep the deeper result already in this slot
+                return
+            self.evictions += 1
+        self._slots[index] = (key, depth, value)
+    
+    def stats(self):
+        """Get hit/miss counts, hit rate and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'size': len(self),
+            'capacity': self.capacity,
+        }
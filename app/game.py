@@ -4,80 +4,84 @@ Handles game state, input processing, and game loop
 """
 
 import pygame
-from .config import *
-from .player import Player
+from .controls import *
+from .engine import Engine, MOVE_LEFT, MOVE_RIGHT, ROTATE, HARD_DROP, SOFT_DROP
 
+# Key that triggers each action, per player (the first binding when there are two)
+ACTION_KEYS = (
+    {MOVE_LEFT: P1_LEFT, MOVE_RIGHT: P1_RIGHT, ROTATE: P1_ROTATE,
+     HARD_DROP: P1_HARD_DROP, SOFT_DROP: P1_SOFT_DROP},
+    {MOVE_LEFT: P2_LEFT, MOVE_RIGHT: P2_RIGHT, ROTATE: P2_ROTATE,
+     HARD_DROP: P2_HARD_DROP, SOFT_DROP: P2_SOFT_DROP},
+    {MOVE_LEFT: P3_LEFT, MOVE_RIGHT: P3_RIGHT, ROTATE: P3_ROTATE,
+     HARD_DROP: P3_HARD_DROP, SOFT_DROP: P3_SOFT_DROP},
+    {MOVE_LEFT: P4_LEFT, MOVE_RIGHT: P4_RIGHT, ROTATE: P4_ROTATE,
+     HARD_DROP: P4_HARD_DROP, SOFT_DROP: P4_SOFT_DROP},
+    {MOVE_LEFT: P5_LEFT, MOVE_RIGHT: P5_RIGHT, ROTATE: P5_ROTATE,
+     HARD_DROP: P5_HARD_DROP, SOFT_DROP: P5_SOFT_DROP},
+    {MOVE_LEFT: P6_LEFT, MOVE_RIGHT: P6_RIGHT, ROTATE: P6_ROTATE,
+     HARD_DROP: P6_HARD_DROP, SOFT_DROP: P6_SOFT_DROP},
+    {MOVE_LEFT: P7_LEFT, MOVE_RIGHT: P7_RIGHT, ROTATE: P7_ROTATE,
+     HARD_DROP: P7_HARD_DROP, SOFT_DROP: P7_SOFT_DROP},
+    {MOVE_LEFT: P8_LEFT, MOVE_RIGHT: P8_RIGHT, ROTATE: P8_ROTATE,
+     HARD_DROP: P8_HARD_DROP, SOFT_DROP: P8_SOFT_DROP},
+    {MOVE_LEFT: P9_LEFT, MOVE_RIGHT: P9_RIGHT, ROTATE: P9_ROTATE,
+     HARD_DROP: P9_HARD_DROP, SOFT_DROP: P9_SOFT_DROP},
+    {MOVE_LEFT: P10_LEFT, MOVE_RIGHT: P10_RIGHT, ROTATE: P10_ROTATE,
+     HARD_DROP: P10_HARD_DROP, SOFT_DROP: P10_SOFT_DROP},
+    {MOVE_LEFT: P11_LEFT, MOVE_RIGHT: P11_RIGHT, ROTATE: P11_ROTATE,
+     HARD_DROP: P11_HARD_DROP, SOFT_DROP: P11_SOFT_DROP},
+    {MOVE_LEFT: P12_LEFT, MOVE_RIGHT: P12_RIGHT, ROTATE: P12_ROTATE,
+     HARD_DROP: P12_HARD_DROP, SOFT_DROP: P12_SOFT_DROP},
+    {MOVE_LEFT: P13_LEFT, MOVE_RIGHT: P13_RIGHT, ROTATE: P13_ROTATE,
+     HARD_DROP: P13_HARD_DROP, SOFT_DROP: P13_SOFT_DROP},
+    {MOVE_LEFT: P14_LEFT, MOVE_RIGHT: P14_RIGHT, ROTATE: P14_ROTATE,
+     HARD_DROP: P14_HARD_DROP, SOFT_DROP: P14_SOFT_DROP},
+    {MOVE_LEFT: P15_LEFT, MOVE_RIGHT: P15_RIGHT, ROTATE: P15_ROTATE,
+     HARD_DROP: P15_HARD_DROP, SOFT_DROP: P15_SOFT_DROP},
+    {MOVE_LEFT: P16_LEFT, MOVE_RIGHT: P16_RIGHT, ROTATE: P16_ROTATE,
+     HARD_DROP: P16_HARD_DROP, SOFT_DROP: P16_SOFT_DROP},
+)
 
-class Game:
+# Second bindings: the down key is also a hard drop (直接到底)
+EXTRA_KEYS = (
+    {P1_DOWN: HARD_DROP},
+    {P2_DOWN: HARD_DROP},
+)
+
+
+def action_events(player_index, actions):
+    """Get KEYDOWN events that make handle_input apply actions (e.g. a bot route)"""
+    keys = ACTION_KEYS[player_index]
+    return [pygame.event.Event(pygame.KEYDOWN, key=keys[action]) for action in actions]
+
+
+def key_dispatch(num_players):
+    """Build the key -> (player_index, action) table for the first num_players players"""
+    dispatch = {}
+    for player_index in range(min(num_players, len(ACTION_KEYS))):
+        for action, key in ACTION_KEYS[player_index].items():
+            dispatch[key] = (player_index, action)
+        if player_index < len(EXTRA_KEYS):
+            for key, action in EXTRA_KEYS[player_index].items():
+                dispatch[key] = (player_index, action)
+    return dispatch
+
+
+class Game(Engine):
     """Main game class"""
     
-    def __init__(self, num_players=1):
-        self.num_players = num_players
-        self.players = []
+    def __init__(self, num_players=1, seed=None):
+        super().__init__(num_players, seed=seed)
         self.clock = pygame.time.Clock()
-        self.running = True
-        
-        # Initialize players
-        for i in range(num_players):
-            player = Player(i + 1, BOARD_WIDTH, BOARD_HEIGHT)
-            self.players.append(player)
+        # One lookup routes any key to its player, however many are playing
+        self.key_actions = key_dispatch(num_players)
     
     def handle_input(self, event):
         """Handle keyboard input"""
         if event.type != pygame.KEYDOWN:
             return
         
-        # Player 1 controls
-        if self.num_players >= 1:
-            p1 = self.players[0]
-            if event.key == P1_LEFT:
-                p1.move(-1, 0)
-            elif event.key == P1_RIGHT:
-                p1.move(1, 0)
-            elif event.key == P1_DOWN:
-                # Down key = hard drop (直接到底)
-                p1.hard_drop()
-            elif event.key == P1_ROTATE:
-                p1.rotate_piece()
-            elif event.key == P1_HARD_DROP:
-                # Space key also works as hard drop
-                p1.hard_drop()
-        
-        # Player 2 controls
-        if self.num_players >= 2:
-            p2 = self.players[1]
-            if event.key == P2_LEFT:
-                p2.move(-1, 0)
-            elif event.key == P2_RIGHT:
-                p2.move(1, 0)
-            elif event.key == P2_DOWN:
-                # Down key = hard drop (直接到底)
-                p2.hard_drop()
-            elif event.key == P2_ROTATE:
-                p2.rotate_piece()
-            elif event.key == P2_HARD_DROP:
-                # Q key also works as hard drop
-                p2.hard_drop()
-    
-    def update(self, dt):
-        """Update game state"""
-        for player in self.players:
-            player.update(dt)
-        
-        # Check if game should end
-        if any(player.game_over for player in self.players):
-            self.running = False
-    
-    def is_game_over(self):
-        """Check if game is over"""
-        return not self.running or any(player.game_over for player in self.players)
-    
-    def get_ranking(self):
-        """Get current ranking of players by score"""
-        ranked_players = sorted(
-            self.players,
-            key=lambda p: p.score,
-            reverse=True
-        )
-        return ranked_players
-
+        binding = self.key_actions.get(event.key)
+        if binding is not None:
+            self.apply_action(*binding)
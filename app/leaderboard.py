@@ -0,0 +1,303 @@
+"""
+Leaderboard over the full game history
+Sorted score indexes with O(log n) inserts and rank, percentile and top-K
+queries, overall and per level or per day
+"""
+
+import calendar
+import math
+import time
+from array import array
+from bisect import bisect_left, insort
+
+# Sort keys pack (score, row): score in the high 32 bits, and the row
+# inverted in the low 32 so that among equal scores the earlier game ranks
+# first when the index is read from the top
+_ROW_BITS = 32
+_ROW_MASK = (1 << _ROW_BITS) - 1
+
+
+def _key(score, row):
+    return (score << _ROW_BITS) | (_ROW_MASK - row)
+
+
+def _row(key):
+    return _ROW_MASK - (key & _ROW_MASK)
+
+
+def day_of(timestamp):
+    """Get the UTC 'YYYY-MM-DD' day a timestamp falls on"""
+    return time.strftime('%Y-%m-%d', time.gmtime(timestamp))
+
+
+def _day_number(day):
+    """Days since the epoch for a 'YYYY-MM-DD' day"""
+    return calendar.timegm(time.strptime(day, '%Y-%m-%d')) // 86400
+
+
+# Stored date of entries recorded without one (older score files); they are
+# left out of per-day queries
+UNKNOWN_DATE = math.nan
+
+
+class SortedIndex:
+    """Sorted multiset of ints kept as bounded array blocks
+    
+    A Fenwick tree over the block sizes finds the block holding any position
+    or key in O(log n), and an insert only shifts one block, so inserts,
+    ranks and positional lookups stay logarithmic (plus a bounded block
+    shift) however large the index grows.
+    """
+    
+    BLOCK_SIZE = 1024
+    
+    def __init__(self, sorted_keys=()):
+        """Start from already sorted keys (a bulk load), or empty"""
+        keys = array('Q', sorted_keys)
+        size = self.BLOCK_SIZE
+        self._blocks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+        self._rebuild_tree()
+    
+    def __len__(self):
+        return self._len
+    
+    def _rebuild_tree(self):
+        """Recompute the Fenwick tree after blocks were created or split"""
+        tree = [len(block) for block in self._blocks]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+    
+    def _tree_add(self, i, delta):
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+    
+    def _prefix(self, i):
+        """Number of items in blocks before block i"""
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i - 1]
+            i &= i - 1
+        return total
+    
+    def add(self, key):
+        """Insert key"""
+        self._len += 1
+        if not self._blocks:
+            self._blocks.append(array('Q', [key]))
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+        
+        i = bisect_left(self._maxes, key)
+        if i == len(self._blocks):
+            i -= 1
+        block = self._blocks[i]
+        insort(block, key)
+        self._maxes[i] = block[-1]
+        
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks[i:i + 1] = [block[:half], block[half:]]
+            self._maxes[i:i + 1] = [block[half - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(i, 1)
+    
+    def count_below(self, key):
+        """Number of items strictly less than key"""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._blocks):
+            return self._len
+        return self._prefix(i) + bisect_left(self._blocks[i], key)
+    
+    def _locate(self, index):
+        """Get (block, offset) of a position, by descending the Fenwick tree"""
+        block = 0
+        step = 1 << len(self._tree).bit_length()
+        while step:
+            following = block + step
+            if following <= len(self._tree) and self._tree[following - 1] <= index:
+                index -= self._tree[following - 1]
+                block = following
+            step >>= 1
+        return block, index
+    
+    def descending(self, start=0):
+        """Iterate items from largest to smallest, skipping the first start"""
+        if start >= self._len:
+            return
+        block, offset = self._locate(self._len - 1 - start)
+        blocks = self._blocks
+        while block >= 0:
+            values = blocks[block]
+            for j in range(offset, -1, -1):
+                yield values[j]
+            block -= 1
+            if block >= 0:
+                offset = len(blocks[block]) - 1
+
+
+class Leaderboard:
+    """Every recorded game, indexed by score overall, per level and per day
+    
+    Rows are kept in compact columns; the indexes hold packed sort keys.
+    The best top_k entries are also kept as ready-made dicts, so drawing a
+    high-score table is a list slice.
+    """
+    
+    def __init__(self, entries=(), top_k=10):
+        self.top_k = top_k
+        self.scores = array('Q')
+        self.levels = array('H')
+        self.lines = array('L')
+        self.dates = array('d')
+        self.ids = []
+        
+        # Loading history sorts once instead of inserting game by game
+        for entry in entries:
+            self._append_row(entry)
+        keys = sorted(_key(score, row) for row, score in enumerate(self.scores))
+        by_level = {}
+        by_day = {}
+        for key in keys:
+            row = _row(key)
+            by_level.setdefault(self.levels[row], []).append(key)
+            if not math.isnan(self.dates[row]):
+                by_day.setdefault(int(self.dates[row] // 86400), []).append(key)
+        self._index = SortedIndex(keys)
+        self._by_level = {level: SortedIndex(group) for level, group in by_level.items()}
+        self._by_day = {day: SortedIndex(group) for day, group in by_day.items()}
+        self._top = []
+        self._top = self.top(top_k)
+    
+    def __len__(self):
+        return len(self.scores)
+    
+    def _append_row(self, entry):
+        """Store an entry in the columns and return its row"""
+        self.scores.append(entry['score'])
+        self.levels.append(entry.get('level', 1))
+        self.lines.append(entry.get('lines', 0))
+        self.dates.append(entry.get('date', UNKNOWN_DATE))
+        self.ids.append(entry.get('id'))
+        return len(self.scores) - 1
+    
+    def add(self, entry):
+        """Record one game given as a score entry dict; returns its overall rank"""
+        row = self._append_row(entry)
+        score = self.scores[row]
+        key = _key(score, row)
+        self._index.add(key)
+        self._by_level.setdefault(self.levels[row], SortedIndex()).add(key)
+        if not math.isnan(self.dates[row]):
+            self._by_day.setdefault(int(self.dates[row] // 86400), SortedIndex()).add(key)
+        
+        if len(self._top) < self.top_k or score > self._top[-1]['score']:
+            self._top = [self.entry(_row(k)) for k in self._take(self._index.descending(), self.top_k)]
+        return self.rank(score)
+    
+    def entry(self, row):
+        """Get a recorded game as a dict like the ones RankingSystem stores"""
+        entry = {
+            'score': self.scores[row],
+            'level': self.levels[row],
+            'lines': self.lines[row],
+        }
+        if not math.isnan(self.dates[row]):
+            entry['date'] = self.dates[row]
+        if self.ids[row] is not None:
+            entry['id'] = self.ids[row]
+        return entry
+    
+    def _take(self, keys, count):
+        result = []
+        for key in keys:
+            if len(result) == count:
+                break
+            result.append(key)
+        return result
+    
+    def _indexes(self, level, day):
+        """Get the index to query and a row filter for the remaining condition"""
+        if level is not None and day is not None:
+            index = self._by_day.get(_day_number(day))
+            return index, (lambda row: self.levels[row] == level)
+        if level is not None:
+            return self._by_level.get(level), None
+        if day is not None:
+            return self._by_day.get(_day_number(day)), None
+        return self._index, None
+    
+    def count(self, level=None, day=None):
+        """Number of games matching the filters"""
+        index, keep = self._indexes(level, day)
+        if index is None:
+            return 0
+        if keep is None:
+            return len(index)
+        return sum(1 for key in index.descending() if keep(_row(key)))
+    
+    def rank(self, score, level=None, day=None):
+        """Get the 1-based rank a score has (or would have) among matching games"""
+        index, keep = self._indexes(level, day)
+        if index is None:
+            return 1
+        threshold = _key(score + 1, _ROW_MASK)
+        if keep is None:
+            return len(index) - index.count_below(threshold) + 1
+        higher = 0
+        for key in index.descending():
+            if key < threshold:
+                break
+            higher += keep(_row(key))
+        return higher + 1
+    
+    def percentile(self, score, level=None, day=None):
+        """Get the percentage of matching games that scored below score"""
+        index, keep = self._indexes(level, day)
+        if index is None or not len(index):
+            return 0.0
+        threshold = _key(score, _ROW_MASK)
+        if keep is None:
+            return 100.0 * index.count_below(threshold) / len(index)
+        total = below = 0
+        for key in index.descending():
+            if keep(_row(key)):
+                total += 1
+                below += key < threshold
+        return 100.0 * below / total if total else 0.0
+    
+    def top(self, count=10, offset=0, level=None, day=None):
+        """Get the best matching games, skipping the first offset"""
+        if level is None and day is None and offset + count <= len(self._top):
+            return self._top[offset:offset + count]
+        index, keep = self._indexes(level, day)
+        if index is None:
+            return []
+        if keep is None:
+            keys = index.descending(offset)
+        else:
+            keys = (key for key in index.descending() if keep(_row(key)))
+            for _ in zip(range(offset), keys):
+                pass
+        return [self.entry(_row(key)) for key in self._take(keys, count)]
+    
+    def page(self, number, per_page=10, level=None, day=None):
+        """Get one 0-based page of the ranking"""
+        return self.top(per_page, number * per_page, level, day)
+    
+    def levels_played(self):
+        """Get the levels that have at least one game, in order"""
+        return sorted(self._by_level)
+    
+    def days_played(self):
+        """Get the days ('YYYY-MM-DD') that have at least one game, in order"""
+        return [day_of(day * 86400) for day in sorted(self._by_day)]
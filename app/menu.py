@@ -1,24 +1,29 @@
 """
 Main menu system for Tetris game
-Handles mode selection (1-player vs 2-player)
+Handles mode selection (1-player, 2-player or party)
 """
 
 import pygame
 from .config import *
+from .text_cache import LazyFont, get_text_cache
 
 
 class Menu:
     """Main menu class"""
     
-    def __init__(self, screen):
+    # Loaded on first draw, shared with the UI
+    font_large = LazyFont(FONT_SIZE_LARGE)
+    font_medium = LazyFont(FONT_SIZE_MEDIUM)
+    font_small = LazyFont(FONT_SIZE_SMALL)
+    
+    def __init__(self, screen, text_cache=None):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.text_cache = text_cache or get_text_cache()
         self.selected_option = 0
         self.options = [
             ("1 Player", 1),
             ("2 Players", 2),
+            (f"Party ({PARTY_PLAYERS} Players)", PARTY_MODE),
             ("Rankings", 3),
             ("Quit", 0)
         ]
@@ -39,7 +44,7 @@ class Menu:
         self.screen.fill(BLACK)
         
         # Title
-        title = self.font_large.render("TETRIS", True, WHITE)
+        title = self.text_cache.render(self.font_large, "TETRIS", WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 150))
         self.screen.blit(title, title_rect)
         
@@ -47,7 +52,7 @@ class Menu:
         start_y = SCREEN_HEIGHT // 2 - 50
         for i, (text, _) in enumerate(self.options):
             color = (255, 255, 0) if i == self.selected_option else WHITE
-            option_text = self.font_medium.render(text, True, color)
+            option_text = self.text_cache.render(self.font_medium, text, color)
             option_rect = option_text.get_rect(center=(SCREEN_WIDTH // 2, start_y + i * 60))
             self.screen.blit(option_text, option_rect)
         
@@ -58,7 +63,7 @@ class Menu:
         ]
         inst_y = SCREEN_HEIGHT - 100
         for i, inst in enumerate(instructions):
-            inst_text = self.font_small.render(inst, True, GRAY)
+            inst_text = self.text_cache.render(self.font_small, inst, GRAY)
             inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, inst_y + i * 25))
             self.screen.blit(inst_text, inst_rect)
 
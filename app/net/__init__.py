@@ -0,0 +1,4 @@
+"""
+Networked matches
+asyncio game server and load-test client speaking newline-delimited JSON
+"""
@@ -0,0 +1,240 @@
+"""
+Load-test client for the match server
+Opens many connections, plays random actions and reports throughput and
+action round-trip latency
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from ..config import SERVER_HOST, SERVER_PORT
+from .protocol import encode
+
+ACTION_MESSAGES = (
+    {'type': 'move', 'dx': -1},
+    {'type': 'move', 'dx': 1},
+    {'type': 'rotate'},
+    {'type': 'soft_drop'},
+    {'type': 'hard_drop'},
+)
+
+
+class LoadStats:
+    """Counters shared by every simulated client"""
+    
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.disconnected = 0
+        self.frames = 0
+        self.bytes = 0
+        self.actions = 0
+        self.errors = 0
+        self.games = 0
+        self.latencies = []
+        self.spectators = 0
+        self.spectator_frames = 0
+        self.spectator_bytes = 0
+    
+    def report(self, seconds):
+        """Summary as a dict of plain numbers"""
+        latencies = sorted(self.latencies)
+        
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 2)
+        
+        return {
+            'connected': self.connected,
+            'failed': self.failed,
+            'disconnected': self.disconnected,
+            'actions_per_s': round(self.actions / seconds, 1),
+            'frames_per_s': round(self.frames / seconds, 1),
+            'kbytes_per_s': round(self.bytes / seconds / 1024, 1),
+            'errors': self.errors,
+            'spectators': self.spectators,
+            'spectator_frames_per_s': round(self.spectator_frames / seconds, 1),
+            'spectator_kbytes_per_s': round(self.spectator_bytes / seconds / 1024, 1),
+            'games_finished': self.games,
+            'latency_p50_ms': percentile(50),
+            'latency_p99_ms': percentile(99),
+        }
+
+
+async def run_client(host, port, match, players, rate, deadline, stats):
+    """One client: join match, send rate actions per second until deadline"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    writer.write(encode({'type': 'join', 'match': match, 'players': players}))
+    
+    seat = None
+    # Actions are only accepted once every seat of the match is taken
+    playing = False
+    sent_at = {}
+    rounds = [0]
+    loop = asyncio.get_event_loop()
+    
+    async def receive():
+        nonlocal seat, playing
+        while True:
+            line = await reader.readline()
+            if not line:
+                stats.disconnected += 1
+                return
+            stats.bytes += len(line)
+            # Only parse what is needed: the seat, errors, and acks while
+            # actions are in flight
+            if (playing and not sent_at and line.startswith(b'{"type":"state"')
+                    and b'"status":"over"' not in line):
+                stats.frames += 1
+                continue
+            message = json.loads(line)
+            kind = message['type']
+            if kind == 'joined':
+                seat = message['seat']
+            elif kind == 'error':
+                stats.errors += 1
+            elif kind == 'state':
+                stats.frames += 1
+                playing = message['status'] == 'playing'
+                if seat is not None:
+                    ack = message['players'][seat]['ack']
+                    now = loop.time()
+                    for seq in [seq for seq in sent_at if seq <= ack]:
+                        stats.latencies.append(now - sent_at.pop(seq))
+                if message['status'] == 'over':
+                    # Keep the load steady: the match's clients all rejoin
+                    # the same fresh match
+                    stats.games += 1
+                    seat = None
+                    playing = False
+                    sent_at.clear()
+                    rounds[0] += 1
+                    writer.write(encode({
+                        'type': 'join', 'match': f"{match}/{rounds[0]}", 'players': players
+                    }))
+    
+    receiver = asyncio.ensure_future(receive())
+    seq = 0
+    try:
+        while loop.time() < deadline and not receiver.done():
+            # Spread clients out instead of sending in lockstep
+            await asyncio.sleep(random.expovariate(rate))
+            if seat is None or not playing:
+                continue
+            seq += 1
+            message = dict(random.choice(ACTION_MESSAGES), seq=seq)
+            sent_at[seq] = loop.time()
+            writer.write(encode(message))
+            stats.actions += 1
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        receiver.cancel()
+        writer.close()
+
+
+async def run_spectator(host, port, match, deadline, stats):
+    """One spectator: follow match (and the rematches its players join) until deadline"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.spectators += 1
+    loop = asyncio.get_event_loop()
+    rounds = 0
+    try:
+        while loop.time() < deadline:
+            name = f"{match}/{rounds}" if rounds else match
+            writer.write(encode({'type': 'spectate', 'match': name}))
+            reply = json.loads(await reader.readline())
+            if reply['type'] == 'error':
+                # The players have not joined yet
+                await asyncio.sleep(0.1)
+                continue
+            while True:
+                size = int.from_bytes(await reader.readexactly(2), 'little')
+                if not size:
+                    rounds += 1
+                    break
+                await reader.readexactly(size)
+                stats.spectator_frames += 1
+                stats.spectator_bytes += size + 2
+                if loop.time() >= deadline:
+                    return
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+def _raise_file_limit():
+    """Allow as many open sockets as the hard limit permits"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def run_load(host, port, clients, players, rate, duration, ramp, spectators=0):
+    """Run clients (grouped players to a match, plus spectators per match) for duration seconds"""
+    stats = LoadStats()
+    loop = asyncio.get_event_loop()
+    started = loop.time()
+    deadline = started + ramp + duration
+    tasks = []
+    for i in range(clients):
+        match = f"load-{i // players}"
+        tasks.append(asyncio.ensure_future(
+            run_client(host, port, match, players, rate, deadline, stats)
+        ))
+        if i % players == players - 1:
+            for _ in range(spectators):
+                tasks.append(asyncio.ensure_future(
+                    run_spectator(host, port, match, deadline, stats)
+                ))
+        # Ramp connections up instead of opening them all at once
+        await asyncio.sleep(ramp / clients)
+    await asyncio.gather(*tasks)
+    return stats, loop.time() - started
+
+
+def main():
+    """Run a load test against a running server"""
+    parser = argparse.ArgumentParser(description="Load-test the Tetris match server")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--clients', type=int, default=1000, help="connections to open")
+    parser.add_argument('--players', type=int, default=2, help="clients per match")
+    parser.add_argument('--rate', type=float, default=4.0, help="actions per second per client")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to play after ramp-up")
+    parser.add_argument('--spectators', type=int, default=0, help="spectator connections per match")
+    parser.add_argument('--ramp', type=float, default=2.0, help="seconds over which to open connections")
+    args = parser.parse_args()
+    
+    _raise_file_limit()
+    started = time.perf_counter()
+    stats, seconds = asyncio.run(run_load(
+        args.host, args.port, args.clients, args.players, args.rate, args.duration, args.ramp,
+        args.spectators
+    ))
+    for name, value in stats.report(seconds).items():
+        print(f"{name}: {value}")
+    print(f"{time.perf_counter() - started:.1f}s wall")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Wire protocol for networked matches
+One JSON object per line in both directions
+"""
+
+import json
+import weakref
+
+from ..engine.actions import MOVE_LEFT, MOVE_RIGHT, ROTATE, HARD_DROP, SOFT_DROP
+from ..engine.search import board_rows
+
+# player -> (board_version, row bitmasks); rows only change when a piece locks
+_rows_cache = weakref.WeakKeyDictionary()
+
+# Client message types that are player actions ('move' takes a dx of -1 or 1)
+ACTION_TYPES = {
+    'rotate': ROTATE,
+    'hard_drop': HARD_DROP,
+    'soft_drop': SOFT_DROP,
+}
+
+
+def encode(message):
+    """Serialize a message as one compact JSON line"""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def decode(line):
+    """Parse one received line; raises ValueError if it is not a message"""
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ValueError("invalid JSON") from None
+    if not isinstance(message, dict) or not isinstance(message.get('type'), str):
+        raise ValueError("message must be an object with a 'type'")
+    return message
+
+
+def parse_action(message):
+    """Get the engine action id of an action message; raises ValueError"""
+    kind = message['type']
+    if kind == 'move':
+        dx = message.get('dx')
+        if dx == -1:
+            return MOVE_LEFT
+        if dx == 1:
+            return MOVE_RIGHT
+        raise ValueError("move needs a dx of -1 or 1")
+    action = ACTION_TYPES.get(kind)
+    if action is None:
+        raise ValueError(f"unknown message type {kind!r}")
+    return action
+
+
+def _rows(player):
+    """Board row bitmasks, recomputed only after the board changed"""
+    cached = _rows_cache.get(player)
+    if cached is None or cached[0] != player.board_version:
+        cached = (player.board_version, board_rows(player))
+        _rows_cache[player] = cached
+    return cached[1]
+
+
+def player_key(player):
+    """Everything player_state reports except the ack, for change detection"""
+    piece = player.current_piece
+    if piece is None:
+        return (player.board_version, player.score, player.game_over)
+    return (
+        player.board_version,
+        player.score,
+        player.game_over,
+        piece.shape_type,
+        piece.rotation_index,
+        piece.x,
+        piece.y,
+    )
+
+
+def player_state(player, ack):
+    """Snapshot of one player: stats, piece, next piece and board row bitmasks"""
+    piece = player.current_piece
+    return {
+        'score': player.score,
+        'level': player.level,
+        'lines': player.lines_cleared,
+        'game_over': player.game_over,
+        'piece': [piece.shape_type, piece.rotation_index, piece.x, piece.y] if piece else None,
+        'next': player.next_piece.shape_type if player.next_piece else None,
+        'rows': _rows(player),
+        # Highest 'seq' of this player's actions applied so far
+        'ack': ack,
+    }
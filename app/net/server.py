@@ -0,0 +1,427 @@
+"""
+Authoritative asyncio game server
+Hosts many headless matches in one process, ticks them all on one fixed-rate
+scheduler and streams each match's state to its clients
+"""
+
+import argparse
+import asyncio
+import random
+from collections import deque
+
+from ..config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_TICK_MS,
+    SERVER_WRITE_BUFFER,
+    SERVER_MAX_LINE,
+    SERVER_MAX_ACTIONS_PER_TICK,
+    SIMULATION_STEP_MS,
+)
+from ..engine import Engine
+from ..timestep import FixedTimestep
+from .protocol import encode, decode, parse_action, player_key, player_state
+from .spectator import SpectatorFeed
+
+# Control replies (errors, join results) kept for a client that is not reading
+MAX_QUEUED_REPLIES = 64
+
+
+class Connection:
+    """One client: its seat and its outgoing messages
+    
+    Replies are queued in order, but only the newest state frame is kept:
+    while a slow client's socket buffer is over the high-water mark, newer
+    frames replace unsent ones instead of piling up in memory.
+    """
+    
+    def __init__(self, reader, writer, write_buffer=SERVER_WRITE_BUFFER):
+        self.reader = reader
+        self.writer = writer
+        self.write_buffer = write_buffer
+        self.match = None
+        self.seat = None
+        # Match this connection is spectating, if any
+        self.watching = None
+        self.replies = deque()
+        self.state = None
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self._wakeup = asyncio.Event()
+    
+    def send(self, message):
+        """Queue a reply message"""
+        if len(self.replies) < MAX_QUEUED_REPLIES:
+            self.replies.append(encode(message))
+            self._wakeup.set()
+    
+    def send_state(self, frame):
+        """Send frame (already encoded) now, or make it the next state to send"""
+        if (self.state is None and not self.replies
+                and self.writer.transport.get_write_buffer_size() < self.write_buffer):
+            # Common case: the socket keeps up, so skip waking the writer task
+            self.writer.write(frame)
+            self.frames_sent += 1
+            return
+        if self.state is not None:
+            self.frames_dropped += 1
+        self.state = frame
+        self._wakeup.set()
+    
+    def send_frame(self, data, force=False):
+        """Write a length-prefixed binary spectator frame now
+        
+        Returns False, without writing, while the socket buffer is over the
+        limit (unless force), so the feed resyncs this client later.
+        """
+        if not force and self.writer.transport.get_write_buffer_size() >= self.write_buffer:
+            return False
+        while self.replies:
+            self.writer.write(self.replies.popleft())
+        self.writer.write(len(data).to_bytes(2, 'little') + data)
+        return True
+    
+    async def write_loop(self):
+        """Write queued data, waiting for the socket to drain (backpressure)"""
+        writer = self.writer
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self.replies:
+                writer.write(self.replies.popleft())
+            if self.state is not None:
+                writer.write(self.state)
+                self.state = None
+                self.frames_sent += 1
+            await writer.drain()
+
+
+class Match:
+    """One engine and the connections seated in it"""
+    
+    def __init__(self, name, num_players, step_ms=SIMULATION_STEP_MS):
+        self.name = name
+        self.engine = Engine(num_players, seed=random.getrandbits(64))
+        self.seats = [None] * num_players
+        self.acks = [0] * num_players
+        self.timestep = FixedTimestep(step_ms)
+        self.started = False
+        self._pending = []
+        self._counts = [0] * num_players
+        self._last_key = None
+        # Spectator connections and their shared delta feed
+        self.spectators = []
+        self.feed = None
+    
+    @property
+    def connections(self):
+        return [conn for conn in self.seats if conn is not None]
+    
+    def join(self, conn):
+        """Seat conn in the first free seat; starts the match once every seat is taken"""
+        seat = self.seats.index(None)
+        self.seats[seat] = conn
+        conn.match = self
+        conn.seat = seat
+        if None not in self.seats:
+            self.started = True
+        return seat
+    
+    def leave(self, conn):
+        """Free conn's seat (the board keeps falling until it tops out)"""
+        self.seats[conn.seat] = None
+        conn.match = None
+        conn.seat = None
+    
+    def watch(self, conn):
+        """Add a spectator; its frames start with a keyframe"""
+        if self.feed is None:
+            self.feed = SpectatorFeed(self.engine)
+        self.spectators.append(conn)
+        self.feed.subscribe(conn.send_frame)
+        conn.watching = self
+    
+    def unwatch(self, conn):
+        self.spectators.remove(conn)
+        self.feed.unsubscribe(conn.send_frame)
+        conn.watching = None
+    
+    def queue_action(self, seat, action, seq=None):
+        """Queue an action for the next tick (of a started match); False if the
+        seat's per-tick limit is reached"""
+        if self._counts[seat] >= SERVER_MAX_ACTIONS_PER_TICK:
+            return False
+        self._counts[seat] += 1
+        self._pending.append((seat, action, seq))
+        return True
+    
+    def tick(self, elapsed_ms):
+        """Apply queued actions, then advance the engine by elapsed_ms in fixed steps"""
+        engine = self.engine
+        for seat, action, seq in self._pending:
+            engine.apply_action(seat, action)
+            if isinstance(seq, int) and seq > self.acks[seat]:
+                self.acks[seat] = seq
+        self._pending.clear()
+        self._counts = [0] * len(self.seats)
+        engine.advance(self.timestep.step_ms, self.timestep.advance(elapsed_ms))
+    
+    def changed(self):
+        """Whether the state differs from the last time this was called"""
+        key = (tuple(self.acks), [player_key(player) for player in self.engine.players])
+        if key == self._last_key:
+            return False
+        self._last_key = key
+        return True
+    
+    @property
+    def over(self):
+        return self.started and self.engine.is_game_over()
+    
+    def state(self):
+        """State message shared by every client of the match"""
+        if not self.started:
+            status = 'waiting'
+        elif self.over:
+            status = 'over'
+        else:
+            status = 'playing'
+        return {
+            'type': 'state',
+            'match': self.name,
+            'frame': self.engine.frame,
+            'status': status,
+            'players': [
+                player_state(player, ack)
+                for player, ack in zip(self.engine.players, self.acks)
+            ],
+        }
+
+
+class GameServer:
+    """TCP server running every match on one shared tick
+    
+    Clients send {"type": "join", "match": name, "players": n} and then
+    action messages ("move" with dx, "rotate", "hard_drop", "soft_drop",
+    each with an optional int "seq"). {"type": "spectate", "match": name}
+    instead streams app.net.spectator frames, each prefixed with its
+    length as two little-endian bytes, until a zero-length frame ends the
+    match. Every tick, each started match is
+    advanced and, if anything changed, its state is encoded once and handed
+    to all of its clients.
+    """
+    
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, tick_ms=SERVER_TICK_MS,
+                 step_ms=SIMULATION_STEP_MS, write_buffer=SERVER_WRITE_BUFFER):
+        self.host = host
+        self.port = port
+        self.tick_ms = tick_ms
+        self.step_ms = step_ms
+        self.write_buffer = write_buffer
+        self.matches = {}
+        self.connections = set()
+        self.ticks = 0
+        # Ticks that started more than a whole interval late (server overloaded)
+        self.late_ticks = 0
+        self._server = None
+        self._ticker = None
+        self._handlers = set()
+    
+    async def start(self):
+        """Start listening and ticking; returns the bound port"""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=SERVER_MAX_LINE
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.ensure_future(self._tick_loop())
+        return self.port
+    
+    async def close(self):
+        """Stop accepting, stop ticking and disconnect every client"""
+        self._ticker.cancel()
+        self._server.close()
+        for conn in list(self.connections):
+            # Abort rather than close: a client that stopped reading would
+            # otherwise hold its connection open until its buffer drained
+            conn.writer.transport.abort()
+        # Let every handler see its connection close and clean up
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+    
+    async def _handle(self, reader, writer):
+        """Serve one client connection until it disconnects"""
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        conn = Connection(reader, writer, self.write_buffer)
+        self.connections.add(conn)
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        sender = asyncio.ensure_future(conn.write_loop())
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    # Reset by the peer, or a line longer than SERVER_MAX_LINE
+                    break
+                if not line:
+                    break
+                self._dispatch(conn, line)
+        finally:
+            match = conn.match
+            if match is not None:
+                match.leave(conn)
+                if not match.connections and self.matches.get(match.name) is match:
+                    # Nobody left to play it
+                    self._end_match(match)
+            if conn.watching is not None:
+                conn.watching.unwatch(conn)
+            self.connections.discard(conn)
+            self._handlers.discard(handler)
+            sender.cancel()
+            writer.close()
+    
+    def _dispatch(self, conn, line):
+        """Handle one client message"""
+        try:
+            message = decode(line)
+            if message['type'] == 'join':
+                self._join(conn, message)
+            elif message['type'] == 'spectate':
+                self._spectate(conn, message)
+            elif conn.match is None:
+                raise ValueError("join a match first")
+            elif not conn.match.started:
+                raise ValueError("match has not started")
+            else:
+                action = parse_action(message)
+                if not conn.match.queue_action(conn.seat, action, message.get('seq')):
+                    raise ValueError("too many actions this tick")
+        except ValueError as error:
+            conn.send({'type': 'error', 'message': str(error)})
+    
+    def _join(self, conn, message):
+        """Seat a client in a named match, creating the match if needed"""
+        if conn.match is not None or conn.watching is not None:
+            raise ValueError("already in a match")
+        name = str(message.get('match', ''))
+        num_players = message.get('players', 1)
+        if not isinstance(num_players, int) or not 1 <= num_players <= 16:
+            raise ValueError("players must be 1-16")
+        
+        match = self.matches.get(name)
+        if match is None:
+            match = Match(name, num_players, self.step_ms)
+            self.matches[name] = match
+        elif match.started:
+            raise ValueError(f"match {name!r} has already started")
+        seat = match.join(conn)
+        conn.send({
+            'type': 'joined',
+            'match': name,
+            'seat': seat,
+            'players': len(match.seats),
+        })
+    
+    def _spectate(self, conn, message):
+        """Start streaming a match's spectator frames to a client"""
+        if conn.match is not None or conn.watching is not None:
+            raise ValueError("already in a match")
+        name = str(message.get('match', ''))
+        match = self.matches.get(name)
+        if match is None:
+            raise ValueError(f"no match {name!r}")
+        conn.send({
+            'type': 'spectating',
+            'match': name,
+            'players': len(match.seats),
+        })
+        match.watch(conn)
+    
+    async def _tick_loop(self):
+        """Call tick every tick_ms without drifting, skipping ticks we cannot make"""
+        loop = asyncio.get_event_loop()
+        interval = self.tick_ms / 1000
+        last = loop.time()
+        next_tick = last + interval
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            now = loop.time()
+            if now - next_tick > interval:
+                self.late_ticks += 1
+                next_tick = now
+            next_tick += interval
+            self.tick((now - last) * 1000)
+            last = now
+    
+    def tick(self, elapsed_ms):
+        """Advance every match and queue its state for its clients"""
+        self.ticks += 1
+        finished = []
+        for name, match in self.matches.items():
+            if not match.started:
+                continue
+            match.tick(elapsed_ms)
+            # Most ticks move nothing (gravity is slower than the tick)
+            if match.changed():
+                frame = encode(match.state())
+                for conn in match.connections:
+                    conn.send_state(frame)
+            if match.spectators:
+                match.feed.publish()
+            if match.over:
+                finished.append(name)
+        
+        for name in finished:
+            self._end_match(self.matches[name])
+    
+    def _end_match(self, match):
+        """Remove a match, freeing its seats and ending its spectator streams"""
+        del self.matches[match.name]
+        for conn in match.connections:
+            match.leave(conn)
+        for conn in list(match.spectators):
+            # A zero-length frame ends the stream
+            conn.send_frame(b'', force=True)
+            match.unwatch(conn)
+    
+    def stats(self):
+        """Counters for monitoring"""
+        return {
+            'connections': len(self.connections),
+            'matches': len(self.matches),
+            'ticks': self.ticks,
+            'late_ticks': self.late_ticks,
+            'frames_dropped': sum(conn.frames_dropped for conn in self.connections),
+            'spectators': sum(len(match.spectators) for match in self.matches.values()),
+        }
+
+
+async def _serve(args):
+    """Run a server until interrupted, printing stats every few seconds"""
+    server = GameServer(args.host, args.port, args.tick_ms)
+    port = await server.start()
+    print(f"Serving on {args.host}:{port}, tick {args.tick_ms}ms")
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(server.stats())
+    finally:
+        await server.close()
+
+
+def main():
+    """Run the game server from the command line"""
+    parser = argparse.ArgumentParser(description="Run the Tetris match server")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--tick-ms', type=int, default=SERVER_TICK_MS)
+    parser.add_argument('--stats-interval', type=float, default=5.0, help="seconds between stats lines")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
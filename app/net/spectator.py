@@ -0,0 +1,297 @@
+"""
+Delta-encoded spectator feed
+Encodes a match as compact binary frames (changed rows, piece, stats) with
+periodic keyframes, once per publish, for any number of subscribers
+"""
+
+from ..config import COLORS, SPECTATOR_KEYFRAME_INTERVAL
+from ..randomizer import PIECE_ORDER
+
+# Frame kinds
+KEYFRAME = 1
+DELTA = 2
+
+# Per-player change flags; GAME_OVER carries the flag's current value
+ROWS = 0x01
+PIECE = 0x02
+STATS = 0x04
+NEXT = 0x08
+GAME_OVER = 0x10
+
+# Shape codes: 0 = none/empty, then PIECE_ORDER; cells use the same codes
+SHAPE_CODES = {shape_type: i + 1 for i, shape_type in enumerate(PIECE_ORDER)}
+SHAPE_TYPES = (None,) + PIECE_ORDER
+_CELL_CODES = {COLORS[shape_type]: code for shape_type, code in SHAPE_CODES.items()}
+CELL_BITS = 3
+
+
+def _put_varint(out, value):
+    """Append an unsigned LEB128 integer"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos):
+    """Read an unsigned LEB128 integer; returns (value, new position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def pack_row(row):
+    """Pack a row of colors (0 = empty) into CELL_BITS-bit shape codes"""
+    packed = 0
+    for x, cell in enumerate(row):
+        if cell != 0:
+            # Any color outside the palette still shows as a filled cell
+            packed |= _CELL_CODES.get(cell, 1) << (x * CELL_BITS)
+    return packed
+
+
+def unpack_row(packed, width):
+    """Get the shape types of a packed row (None = empty)"""
+    mask = (1 << CELL_BITS) - 1
+    return [SHAPE_TYPES[(packed >> (x * CELL_BITS)) & mask] for x in range(width)]
+
+
+class _PlayerTrack:
+    """What the encoder last sent for one player"""
+    
+    __slots__ = ('board_version', 'rows', 'piece', 'stats', 'next', 'game_over')
+    
+    def __init__(self, height):
+        self.board_version = None
+        self.rows = [None] * height
+        self.piece = None
+        self.stats = None
+        self.next = None
+        self.game_over = None
+
+
+class DeltaEncoder:
+    """Turns an engine's state into keyframes and deltas against the last frame
+    
+    A frame is: kind byte, frame number (varint), then per player a flags
+    byte followed by the parts the flags name, in order:
+    ROWS (count byte, then row index byte + packed row each), PIECE (shape,
+    rotation, x, y as bytes), STATS (score, level, lines as varints) and
+    NEXT (shape byte). A keyframe also carries the player count and board
+    size, and every part of every player. Unchanged players cost one byte.
+    """
+    
+    def __init__(self, engine, keyframe_interval=SPECTATOR_KEYFRAME_INTERVAL):
+        self.engine = engine
+        self.keyframe_interval = keyframe_interval
+        self.width = engine.board_width
+        self.height = engine.board_height
+        self.row_bytes = (self.width * CELL_BITS + 7) // 8
+        self._tracks = [_PlayerTrack(self.height) for _ in engine.players]
+        self._since_keyframe = None
+    
+    def _player_parts(self, player, track, full):
+        """Get (flags, payload) for one player, updating its track"""
+        flags = 0
+        payload = bytearray()
+        
+        if full or player.board_version != track.board_version:
+            track.board_version = player.board_version
+            changed = []
+            for y in range(self.height):
+                packed = pack_row(player.board[y])
+                if full or packed != track.rows[y]:
+                    track.rows[y] = packed
+                    changed.append((y, packed))
+            if changed:
+                flags |= ROWS
+                payload.append(len(changed))
+                for y, packed in changed:
+                    payload.append(y)
+                    payload += packed.to_bytes(self.row_bytes, 'little')
+        
+        piece = player.current_piece
+        if piece is None:
+            piece_state = (0, 0, 0, 0)
+        else:
+            piece_state = (SHAPE_CODES[piece.shape_type], piece.rotation_index, piece.x, piece.y)
+        if full or piece_state != track.piece:
+            track.piece = piece_state
+            flags |= PIECE
+            payload.append(piece_state[0])
+            payload.append(piece_state[1])
+            payload += piece_state[2].to_bytes(1, 'little', signed=True)
+            payload += piece_state[3].to_bytes(1, 'little', signed=True)
+        
+        stats = (player.score, player.level, player.lines_cleared)
+        if full or stats != track.stats:
+            track.stats = stats
+            flags |= STATS
+            for value in stats:
+                _put_varint(payload, value)
+        
+        next_code = SHAPE_CODES[player.next_piece.shape_type] if player.next_piece else 0
+        if full or next_code != track.next:
+            track.next = next_code
+            flags |= NEXT
+            payload.append(next_code)
+        
+        changed_over = player.game_over != track.game_over
+        track.game_over = player.game_over
+        if player.game_over:
+            flags |= GAME_OVER
+        return flags, payload, changed_over
+    
+    def keyframe(self):
+        """Encode the full current state (and make later deltas relative to it)"""
+        self._since_keyframe = 0
+        out = bytearray([KEYFRAME])
+        _put_varint(out, self.engine.frame)
+        out += bytes([len(self._tracks), self.width, self.height])
+        for player, track in zip(self.engine.players, self._tracks):
+            flags, payload, _ = self._player_parts(player, track, True)
+            out.append(flags)
+            out += payload
+        return bytes(out)
+    
+    def next_frame(self):
+        """Encode what changed since the last frame, a keyframe when one is due,
+        or None when nothing changed"""
+        if self._since_keyframe is None or self._since_keyframe >= self.keyframe_interval:
+            return self.keyframe()
+        
+        out = bytearray([DELTA])
+        _put_varint(out, self.engine.frame)
+        any_change = False
+        for player, track in zip(self.engine.players, self._tracks):
+            flags, payload, changed_over = self._player_parts(player, track, False)
+            out.append(flags)
+            out += payload
+            any_change = any_change or bool(payload) or changed_over
+        if not any_change:
+            return None
+        self._since_keyframe += 1
+        return bytes(out)
+
+
+class SpectatorFeed:
+    """One encoder fanned out to many subscribers
+    
+    A subscriber is a callable write(frame) that returns False when it
+    cannot take the frame (e.g. its socket is backed up). Missing a delta breaks
+    the chain, so such a subscriber gets a keyframe next instead; new
+    subscribers start with one too. Keyframes for resyncs are encoded at
+    most once per publish.
+    """
+    
+    def __init__(self, engine, keyframe_interval=SPECTATOR_KEYFRAME_INTERVAL):
+        self.encoder = DeltaEncoder(engine, keyframe_interval)
+        self._subscribers = {}
+        self._publishes = 0
+        self._resync_frame = None
+    
+    def __len__(self):
+        return len(self._subscribers)
+    
+    def subscribe(self, write):
+        """Add a subscriber; it receives a keyframe on the next publish"""
+        self._subscribers[write] = True
+    
+    def unsubscribe(self, write):
+        self._subscribers.pop(write, None)
+    
+    def publish(self):
+        """Encode the current state once and send it to every subscriber"""
+        self._publishes += 1
+        frame = self.encoder.next_frame()
+        if frame is not None and frame[0] == KEYFRAME:
+            # A scheduled keyframe resyncs everyone
+            for write in self._subscribers:
+                self._subscribers[write] = False
+        
+        # A resync keyframe only needs encoding if someone needs it and the
+        # encoder is not about to send one anyway; encoding it must not
+        # disturb the delta chain, so it comes from a separate encoder
+        resync = None
+        for write, needs_keyframe in list(self._subscribers.items()):
+            if needs_keyframe:
+                if resync is None:
+                    resync = self._resync_keyframe()
+                data = resync
+            elif frame is None:
+                continue
+            else:
+                data = frame
+            self._subscribers[write] = write(data) is False
+    
+    def _resync_keyframe(self):
+        """Keyframe of the current state for subscribers joining or catching up"""
+        if self._resync_frame is None or self._resync_frame[0] != self._publishes:
+            encoder = DeltaEncoder(self.encoder.engine, self.encoder.keyframe_interval)
+            self._resync_frame = (self._publishes, encoder.keyframe())
+        return self._resync_frame[1]
+
+
+class SpectatorView:
+    """Spectator-side state rebuilt from frames"""
+    
+    def __init__(self):
+        self.frame = None
+        self.width = 0
+        self.height = 0
+        self.players = []
+        self.synced = False
+    
+    def apply(self, data):
+        """Apply one frame; returns False for a delta before any keyframe"""
+        kind = data[0]
+        frame, pos = _get_varint(data, 1)
+        if kind == KEYFRAME:
+            count, self.width, self.height = data[pos], data[pos + 1], data[pos + 2]
+            pos += 3
+            self.players = [
+                {'rows': [0] * self.height, 'piece': None, 'score': 0, 'level': 1,
+                 'lines': 0, 'next': None, 'game_over': False}
+                for _ in range(count)
+            ]
+            self.synced = True
+        elif not self.synced:
+            return False
+        self.frame = frame
+        
+        row_bytes = (self.width * CELL_BITS + 7) // 8
+        for player in self.players:
+            flags = data[pos]
+            pos += 1
+            if flags & ROWS:
+                count = data[pos]
+                pos += 1
+                for _ in range(count):
+                    y = data[pos]
+                    player['rows'][y] = int.from_bytes(data[pos + 1:pos + 1 + row_bytes], 'little')
+                    pos += 1 + row_bytes
+            if flags & PIECE:
+                shape = SHAPE_TYPES[data[pos]]
+                x = int.from_bytes(data[pos + 2:pos + 3], 'little', signed=True)
+                y = int.from_bytes(data[pos + 3:pos + 4], 'little', signed=True)
+                player['piece'] = (shape, data[pos + 1], x, y) if shape else None
+                pos += 4
+            if flags & STATS:
+                player['score'], pos = _get_varint(data, pos)
+                player['level'], pos = _get_varint(data, pos)
+                player['lines'], pos = _get_varint(data, pos)
+            if flags & NEXT:
+                player['next'] = SHAPE_TYPES[data[pos]]
+                pos += 1
+            player['game_over'] = bool(flags & GAME_OVER)
+        return True
+    
+    def cells(self, player_index):
+        """Get a player's board as rows of shape types (None = empty)"""
+        return [unpack_row(row, self.width) for row in self.players[player_index]['rows']]
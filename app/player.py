@@ -3,18 +3,49 @@ Player class to manage individual game state
 Each player has their own board, score, level, etc.
 """
 
-import random
+from .bitboard import BitBoard
+from .config import (
+    USE_BITBOARD,
+    RANDOMIZER_MODE,
+    PREVIEW_PIECES,
+    MAX_GRAVITY_ROWS,
+    SCORE_SINGLE,
+    LINES_PER_LEVEL,
+    INITIAL_FALL_SPEED,
+    LEVEL_SPEED_REDUCTION,
+    MIN_FALL_SPEED,
+)
+from .randomizer import Randomizer
 from .tetromino import Tetromino
+from .zobrist import cell_keys, full_row_keys, piece_key, queue_key
+
+# Horizontal offsets tried, in order, when a rotation collides
+WALL_KICKS = (-1, 1, -2, 2)
 
 
 class Player:
     """Represents a player in the game"""
     
-    def __init__(self, player_id, board_width, board_height):
+    def __init__(self, player_id, board_width, board_height, use_bitboard=USE_BITBOARD, seed=None,
+                 randomizer_mode=RANDOMIZER_MODE, preview_pieces=PREVIEW_PIECES):
         self.player_id = player_id
         self.board_width = board_width
         self.board_height = board_height
-        self.board = [[0 for _ in range(board_width)] for _ in range(board_height)]
+        self.use_bitboard = use_bitboard
+        self.randomizer_mode = randomizer_mode
+        self.preview_pieces = preview_pieces
+        # Bumped whenever locked cells change, so renderers can cache the board
+        self.board_version = 0
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """Start a fresh game on this player, reseeding its piece RNG"""
+        self.board_version += 1
+        if self.use_bitboard:
+            # Row bitmasks + color plane; readable as board[y][x]
+            self.board = BitBoard(self.board_width, self.board_height)
+        else:
+            self.board = [[0 for _ in range(self.board_width)] for _ in range(self.board_height)]
         self.score = 0
         self.level = 1
         self.lines_cleared = 0
@@ -23,7 +54,19 @@ class Player:
         self.game_over = False
         self.fall_time = 0
         self.fall_speed = 500  # milliseconds
-        
+        # Height of the highest block in each column (0 = empty column)
+        self.column_heights = [0] * self.board_width
+        # Number of occupied cells in each row
+        self.row_fill = [0] * self.board_height
+        # Zobrist hash of the locked cells, updated on every lock and clear
+        self._cell_keys = cell_keys(self.board_width, self.board_height)
+        self.board_hash = 0
+        # Per-player randomizer so games with the same seed get the same pieces
+        self.randomizer = Randomizer(
+            seed,
+            self.randomizer_mode,
+            lookahead=max(self.preview_pieces - 1, 0)
+        )
         
         # Initialize with first pieces
         self.next_piece = self._get_random_piece()
@@ -31,8 +74,15 @@ class Player:
     
     def _get_random_piece(self):
         """Generate a random tetromino"""
-        shapes = ['I', 'O', 'T', 'S', 'Z', 'J', 'L']
-        return Tetromino(random.choice(shapes))
+        return Tetromino(self.randomizer.next())
+    
+    def get_preview(self, count=None):
+        """Get the upcoming piece types, starting with next_piece"""
+        if count is None:
+            count = self.preview_pieces
+        if count <= 0:
+            return []
+        return [self.next_piece.shape_type] + self.randomizer.peek(count - 1)
     
     def spawn_piece(self):
         """Spawn a new piece at the top of the board"""
@@ -49,21 +99,79 @@ class Player:
     
     def _check_collision(self, piece, dx=0, dy=0):
         """Check if piece collides with board boundaries or placed blocks"""
-        blocks = piece.get_blocks()
-        for bx, by in blocks:
-            x = piece.x + bx + dx
-            y = piece.y + by + dy
-            
-            # Check boundaries
-            if x < 0 or x >= self.board_width or y >= self.board_height:
-                return True
-            
-            # Check placed blocks (only check if y >= 0)
-            if y >= 0 and self.board[y][x] != 0:
+        if self.use_bitboard:
+            return self.board.collides(piece, dx, dy)
+        
+        table = piece.tables[piece.rotation_index]
+        px = piece.x + dx
+        py = piece.y + dy
+        
+        # Check boundaries against the rotation's bounding box
+        if (px + table.min_x < 0 or px + table.max_x >= self.board_width
+                or py + table.max_y >= self.board_height):
+            return True
+        
+        # Check placed blocks (only check if y >= 0)
+        board = self.board
+        for bx, by in table.blocks:
+            y = py + by
+            if y >= 0 and board[y][px + bx] != 0:
                 return True
         
         return False
     
+    def _is_filled(self, x, y):
+        """Check if a board cell is occupied"""
+        if self.use_bitboard:
+            return self.board.is_filled(x, y)
+        return self.board[y][x] != 0
+    
+    def state_hash(self):
+        """Get a Zobrist hash of the board, current piece and preview queue"""
+        value = self.board_hash
+        piece = self.current_piece
+        if piece is not None:
+            value ^= piece_key(piece.shape_type, piece.rotation_index, piece.x, piece.y)
+        for slot, shape_type in enumerate(self.get_preview()):
+            value ^= queue_key(slot, shape_type)
+        return value
+    
+    def surface_profile(self):
+        """Get height differences between neighbouring columns"""
+        heights = self.column_heights
+        return tuple(heights[x + 1] - heights[x] for x in range(self.board_width - 1))
+    
+    def drop_distance(self, piece=None):
+        """Get how many rows a piece (default: current piece) can fall"""
+        if piece is None:
+            piece = self.current_piece
+        if piece is None:
+            return 0
+        
+        # Land each column's lowest block just above that column's top block
+        table = piece.tables[piece.rotation_index]
+        heights = self.column_heights
+        landing_y = self.board_height
+        for bx, by in table.bottom:
+            column_y = self.board_height - heights[piece.x + bx] - 1 - by
+            if column_y < landing_y:
+                landing_y = column_y
+        
+        if landing_y >= piece.y:
+            return landing_y - piece.y
+        
+        # Piece is below a column's top (under an overhang): search down
+        distance = 0
+        while not self._check_collision(piece, 0, distance + 1):
+            distance += 1
+        return distance
+    
+    def ghost_y(self):
+        """Get the row the current piece would land on"""
+        if not self.current_piece:
+            return None
+        return self.current_piece.y + self.drop_distance()
+    
     def move(self, dx, dy):
         """Try to move the current piece"""
         if not self.current_piece or self.game_over:
@@ -86,7 +194,7 @@ class Player:
         # Check collision
         if self._check_collision(self.current_piece):
             # Try wall kicks
-            for dx in [-1, 1, -2, 2]:
+            for dx in WALL_KICKS:
                 if not self._check_collision(self.current_piece, dx, 0):
                     self.current_piece.x += dx
                     return True
@@ -102,63 +210,128 @@ class Player:
         if not self.current_piece or self.game_over:
             return 0
         
-        drop_distance = 0
-        while self.move(0, 1):
-            drop_distance += 1
+        drop_distance = self.drop_distance()
+        self.current_piece.y += drop_distance
         
         self._lock_piece()
         return drop_distance
     
     def update(self, dt):
-        """Update player state (falling pieces)"""
+        """Update player state (falling pieces)
+        
+        Leftover time carries over to the next call, and a long dt applies
+        several gravity steps (at most MAX_GRAVITY_ROWS), so the fall rate
+        does not depend on how often update is called.
+        """
         if self.game_over or not self.current_piece:
             return
         
         self.fall_time += dt
         
-        if self.fall_time >= self.fall_speed:
-            self.fall_time = 0
+        rows = 0
+        while self.fall_time >= self.fall_speed:
+            self.fall_time -= self.fall_speed
             if not self.move(0, 1):
+                # The next piece starts with a fresh gravity timer
                 self._lock_piece()
+                self.fall_time = 0
+                return
+            rows += 1
+            if rows == MAX_GRAVITY_ROWS:
+                self.fall_time %= self.fall_speed
+                return
     
     def _lock_piece(self):
         """Lock current piece to board"""
         if not self.current_piece:
             return
         
+        touched_rows = set()
         blocks = self.current_piece.get_absolute_blocks()
         for x, y in blocks:
             if 0 <= y < self.board_height and 0 <= x < self.board_width:
-                self.board[y][x] = self.current_piece.color
+                self.row_fill[y] += 1
+                self.board_hash ^= self._cell_keys[y][x]
+                touched_rows.add(y)
+                if self.use_bitboard:
+                    self.board.set_cell(x, y, self.current_piece.color)
+                else:
+                    self.board[y][x] = self.current_piece.color
+                if self.board_height - y > self.column_heights[x]:
+                    self.column_heights[x] = self.board_height - y
         
-        # Clear lines and update score
-        lines_cleared = self._clear_lines()
+        # Clear lines and update score (only rows the piece touched can fill up)
+        lines_cleared = self._clear_lines(touched_rows)
         if lines_cleared > 0:
             self._update_score(lines_cleared)
             self._update_level()
+        self.board_version += 1
         
         # Spawn next piece
         self.spawn_piece()
     
-    def _clear_lines(self):
-        """Clear completed lines and return number of lines cleared"""
-        lines_to_clear = []
+    def _clear_lines(self, rows=None):
+        """Clear completed lines and return number of lines cleared
         
-        for y in range(self.board_height):
-            if all(self.board[y][x] != 0 for x in range(self.board_width)):
-                lines_to_clear.append(y)
+        Only the given rows are checked (all rows if None).
+        """
+        if rows is None:
+            rows = range(self.board_height)
+        lines_to_clear = sorted(y for y in rows if self.row_fill[y] == self.board_width)
+        if not lines_to_clear:
+            return 0
         
-        # Remove cleared lines
-        for y in lines_to_clear:
-            del self.board[y]
-            self.board.insert(0, [0 for _ in range(self.board_width)])
+        # Remove cleared lines, shifting the rest down in a single pass
+        cleared = set(lines_to_clear)
+        self._rehash_clear(cleared)
+        kept = [y for y in range(self.board_height) if y not in cleared]
+        empty = len(lines_to_clear)
+        if self.use_bitboard:
+            self.board.clear_rows(lines_to_clear)
+        else:
+            self.board[:] = (
+                [[0 for _ in range(self.board_width)] for _ in range(empty)]
+                + [self.board[y] for y in kept]
+            )
+        self.row_fill = [0] * empty + [self.row_fill[y] for y in kept]
         
+        self._update_column_heights(lines_to_clear)
         return len(lines_to_clear)
     
+    def _rehash_clear(self, cleared):
+        """Update board_hash for clearing rows: only cells that move or vanish"""
+        keys = self._cell_keys
+        full_keys = full_row_keys(self.board_width, self.board_height)
+        value = self.board_hash
+        shift = 0
+        for y in range(self.board_height - 1, -1, -1):
+            if y in cleared:
+                value ^= full_keys[y]
+                shift += 1
+            elif shift and self.row_fill[y]:
+                old_keys = keys[y]
+                new_keys = keys[y + shift]
+                for x in range(self.board_width):
+                    if self._is_filled(x, y):
+                        value ^= old_keys[x] ^ new_keys[x]
+        self.board_hash = value
+    
+    def _update_column_heights(self, cleared_rows):
+        """Lower column heights after cleared_rows were removed"""
+        for x in range(self.board_width):
+            if self.column_heights[x] == 0:
+                continue
+            
+            # Everything above the old top, plus one row per cleared row
+            # at or below it, is now empty in this column
+            top = self.board_height - self.column_heights[x]
+            y = top + sum(1 for row in cleared_rows if row >= top)
+            while y < self.board_height and not self._is_filled(x, y):
+                y += 1
+            self.column_heights[x] = self.board_height - y
+    
     def _update_score(self, lines_cleared):
         """Update score based on lines cleared"""
-        from .config import SCORE_SINGLE
-        
         # 得分规则：消除的行数作为倍数
         # 消除1行：100分 × 1
         # 消除2行：100分 × 2
@@ -170,8 +343,6 @@ class Player:
     
     def _update_level(self):
         """Update level based on lines cleared"""
-        from .config import LINES_PER_LEVEL, INITIAL_FALL_SPEED, LEVEL_SPEED_REDUCTION, MIN_FALL_SPEED
-        
         new_level = (self.lines_cleared // LINES_PER_LEVEL) + 1
         if new_level > self.level:
             self.level = new_level
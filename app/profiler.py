@@ -0,0 +1,169 @@
+"""
+Per-phase frame profiler
+Times each phase of the main loop into a fixed-size ring buffer
+"""
+
+import csv
+import json
+import time
+from array import array
+from .config import FPS, PROFILER_CAPACITY, PROFILER_STATS_INTERVAL
+
+# Phases of one main-loop frame, in order
+PHASES = ('wait', 'events', 'update', 'draw', 'present')
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class NullProfiler:
+    """Profiler stand-in used when profiling is off; every call is a no-op"""
+    
+    enabled = False
+    show_overlay = False
+    
+    def begin_frame(self, idle=False):
+        pass
+    
+    def mark(self, phase):
+        pass
+    
+    def end_frame(self):
+        pass
+    
+    def draw_overlay(self, screen, text_cache, font):
+        return None
+    
+    def export(self, path):
+        pass
+
+
+class FrameProfiler:
+    """Records per-phase frame times (ms) for the last `capacity` frames"""
+    
+    enabled = True
+    
+    def __init__(self, capacity=PROFILER_CAPACITY, budget_ms=1000 / FPS, phases=PHASES):
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        self.phases = phases
+        self.show_overlay = True
+        self.frames = 0
+        self.dropped_frames = 0
+        
+        # Ring buffers, one per phase plus the full frame interval
+        self._times = {name: array('d', [0.0]) * capacity for name in phases + ('frame',)}
+        self._frame_start = None
+        self._frame_idle = False
+        self._last_mark = None
+        self._slot = 0
+        self._overlay_lines = []
+        self._overlay_rect = None
+    
+    def begin_frame(self, idle=False):
+        """Start timing a frame (call at the top of the loop)
+        
+        An idle frame, one that blocks waiting for input, is not recorded:
+        its wait would count as a slow, dropped frame.
+        """
+        now = time.perf_counter()
+        if self._frame_start is not None and not self._frame_idle:
+            interval = (now - self._frame_start) * 1000
+            self._times['frame'][self._slot] = interval
+            # A frame that took more than 1.5 budgets missed its display slot
+            if interval > self.budget_ms * 1.5:
+                self.dropped_frames += 1
+            self.frames += 1
+            self._slot = self.frames % self.capacity
+        self._frame_start = now
+        self._frame_idle = idle
+        self._last_mark = now
+    
+    def mark(self, phase):
+        """Record the time since the previous mark as `phase`"""
+        now = time.perf_counter()
+        self._times[phase][self._slot] = (now - self._last_mark) * 1000
+        self._last_mark = now
+    
+    def end_frame(self):
+        """Finish a frame, refreshing overlay stats every few frames"""
+        if self.show_overlay and self.frames % PROFILER_STATS_INTERVAL == 0:
+            self._overlay_lines = self._format_summary()
+    
+    def _samples(self, name):
+        """Recorded samples for one series, oldest first"""
+        values = self._times[name]
+        # The current slot belongs to the frame still in progress
+        if self.frames < self.capacity:
+            return list(values[:self.frames])
+        return list(values[self._slot + 1:]) + list(values[:self._slot])
+    
+    def summary(self):
+        """Get p50/p95/p99 (ms) for every phase and the frame interval"""
+        stats = {}
+        for name in self.phases + ('frame',):
+            values = sorted(self._samples(name))
+            stats[name] = {
+                'p50': _percentile(values, 0.50),
+                'p95': _percentile(values, 0.95),
+                'p99': _percentile(values, 0.99),
+            }
+        return stats
+    
+    def _format_summary(self):
+        lines = [f"frames {self.frames}  dropped {self.dropped_frames}"]
+        for name, stats in self.summary().items():
+            lines.append(
+                f"{name:<8}{stats['p50']:6.2f}{stats['p95']:7.2f}{stats['p99']:7.2f}"
+            )
+        return lines
+    
+    def draw_overlay(self, screen, text_cache, font):
+        """Draw the stats overlay in the top-left corner, returning its rect
+        
+        The rect only grows while the overlay is shown, so the overlay always
+        covers what it drew before and nothing beneath needs repainting.
+        """
+        if not self.show_overlay or not self._overlay_lines:
+            self._overlay_rect = None
+            return None
+        texts = [text_cache.render(font, line, (0, 255, 0)) for line in self._overlay_lines]
+        width = max(text.get_width() for text in texts) + 10
+        height = sum(text.get_height() for text in texts) + 10
+        area = (0, 0, width, height)
+        if self._overlay_rect is not None:
+            area = self._overlay_rect.union(area)
+        rect = self._overlay_rect = screen.fill((0, 0, 0), area)
+        
+        y = 5
+        for text in texts:
+            screen.blit(text, (5, y))
+            y += text.get_height()
+        return rect
+    
+    def export(self, path):
+        """Write the recorded frames to a .csv or .json trace file"""
+        names = self.phases + ('frame',)
+        columns = {name: self._samples(name) for name in names}
+        count = len(columns['frame'])
+        
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(names)
+                for i in range(count):
+                    writer.writerow([f"{columns[name][i]:.4f}" for name in names])
+        else:
+            with open(path, 'w') as f:
+                json.dump({
+                    'budget_ms': self.budget_ms,
+                    'frames': self.frames,
+                    'dropped_frames': self.dropped_frames,
+                    'summary': self.summary(),
+                    'samples': columns,
+                }, f)
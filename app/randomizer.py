@@ -0,0 +1,85 @@
+"""
+Seeded piece randomizer
+Deterministic piece sequences with an optional 7-bag and a lookahead queue
+"""
+
+import random
+from collections import deque
+from .config import RANDOMIZER_MODE
+
+# Piece order used for drawing; part of the seed -> sequence contract
+PIECE_ORDER = ('I', 'O', 'T', 'S', 'Z', 'J', 'L')
+
+_MASK64 = (1 << 64) - 1
+
+
+class Randomizer:
+    """Generates the piece sequence for one player from a seed
+    
+    Uses its own SplitMix64 generator so a seed gives the same sequence on
+    every machine and Python version. mode is 'random' (independent draws)
+    or 'bag' (shuffled bags of all seven pieces).
+    """
+    
+    def __init__(self, seed=None, mode=RANDOMIZER_MODE, lookahead=0):
+        if mode not in ('random', 'bag'):
+            raise ValueError(f"unknown randomizer mode: {mode!r}")
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.mode = mode
+        self.lookahead = lookahead
+        self._state = seed & _MASK64
+        self._bag = []
+        self._queue = deque()
+        self._fill_queue()
+    
+    def _next_u64(self):
+        """Advance the SplitMix64 state and return 64 random bits"""
+        self._state = (self._state + 0x9E3779B97F4A7C15) & _MASK64
+        z = self._state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> 31)
+    
+    def randbelow(self, n):
+        """Get an unbiased random integer in [0, n)"""
+        limit = ((1 << 64) // n) * n
+        while True:
+            value = self._next_u64()
+            if value < limit:
+                return value % n
+    
+    def _generate(self):
+        """Draw one piece according to the mode"""
+        if self.mode == 'random':
+            return PIECE_ORDER[self.randbelow(len(PIECE_ORDER))]
+        
+        if not self._bag:
+            # Fisher-Yates shuffle of a fresh bag
+            bag = list(PIECE_ORDER)
+            for i in range(len(bag) - 1, 0, -1):
+                j = self.randbelow(i + 1)
+                bag[i], bag[j] = bag[j], bag[i]
+            self._bag = bag
+        return self._bag.pop()
+    
+    def _fill_queue(self):
+        """Keep `lookahead` pieces queued beyond the next one"""
+        while len(self._queue) < self.lookahead + 1:
+            self._queue.append(self._generate())
+    
+    def next(self):
+        """Get the next piece type"""
+        shape_type = self._queue.popleft()
+        self._fill_queue()
+        return shape_type
+    
+    def peek(self, count=None):
+        """Get upcoming piece types without consuming them"""
+        if count is None:
+            count = self.lookahead + 1
+        if count > len(self._queue):
+            self.lookahead = count - 1
+            self._fill_queue()
+        return [self._queue[i] for i in range(count)]
@@ -3,71 +3,92 @@ Ranking system for both single-player and two-player modes
 Handles high scores and live ranking display
 """
 
-import json
-import os
+import threading
+import time
+from .leaderboard import Leaderboard
+from .score_store import ScoreStore
+
+# Entries shown on the rankings screen (kept in memory by the leaderboard)
+TOP_SCORES = 10
 
 
 class RankingSystem:
     """Manages rankings and high scores"""
     
-    def __init__(self, filename='high_scores.json'):
+    def __init__(self, filename='high_scores.json', preload=True):
         self.filename = filename
-        self.high_scores = []
-        self.load_high_scores()
+        # Journal + snapshot store; writes happen on a background thread
+        self.store = ScoreStore(filename)
+        # Without preload the history is read on first use, or in the
+        # background after load_in_background
+        self._leaderboard = None
+        self._loader = None
+        if preload:
+            self.load_high_scores()
+    
+    @property
+    def leaderboard(self):
+        """Full score history, loaded from the store on first use"""
+        if self._leaderboard is None and self._loader is not None:
+            # Only waits if the background load has not finished yet
+            self._loader.join()
+        if self._leaderboard is None:
+            self.load_high_scores()
+        return self._leaderboard
+    
+    @property
+    def high_scores(self):
+        """Top entries, best first"""
+        return self.leaderboard.top(TOP_SCORES)
     
     def load_high_scores(self):
-        """Load high scores from file"""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    self.high_scores = json.load(f)
-            except:
-                self.high_scores = []
-        else:
-            self.high_scores = []
-        
-        # Sort by score descending
-        self.high_scores.sort(key=lambda x: x['score'], reverse=True)
-        # Keep only top 10
-        self.high_scores = self.high_scores[:10]
+        """Load the full score history from the store"""
+        self._leaderboard = Leaderboard(self.store.load(), top_k=TOP_SCORES)
+    
+    def load_in_background(self):
+        """Start loading the score history on a background thread"""
+        if self._leaderboard is None and self._loader is None:
+            self._loader = threading.Thread(target=self.load_high_scores, daemon=True)
+            self._loader.start()
     
     def save_high_scores(self):
-        """Save high scores to file"""
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.high_scores, f, indent=2)
-        except:
-            pass
+        """Wait until every added score is on disk"""
+        self.store.flush()
+    
+    def close(self):
+        """Finish pending writes"""
+        self.store.close()
     
     def add_score(self, score, level, lines_cleared):
-        """Add a new high score"""
-        entry = {
+        """Record a finished game (written to disk in the background)"""
+        # Loaded before the entry is queued, so a load cannot pick up the
+        # entry from the journal as well
+        leaderboard = self.leaderboard
+        entry = self.store.append({
             'score': score,
             'level': level,
-            'lines': lines_cleared
-        }
-        
-        self.high_scores.append(entry)
-        self.high_scores.sort(key=lambda x: x['score'], reverse=True)
-        self.high_scores = self.high_scores[:10]
-        self.save_high_scores()
+            'lines': lines_cleared,
+            'date': time.time()
+        })
+        return leaderboard.add(entry)
     
     def is_high_score(self, score):
         """Check if score qualifies as high score"""
-        if len(self.high_scores) < 10:
+        high_scores = self.high_scores
+        if len(high_scores) < TOP_SCORES:
             return True
-        return score > self.high_scores[-1]['score']
+        return score > high_scores[-1]['score']
     
     def get_rank(self, score):
-        """Get rank of a score (1-based)"""
-        rank = 1
-        for entry in self.high_scores:
-            if score > entry['score']:
-                return rank
-            rank += 1
-        return rank if len(self.high_scores) < 10 else None
+        """Get rank of a score (1-based) if it makes the high-score table"""
+        rank = self.leaderboard.rank(score)
+        return rank if rank <= TOP_SCORES else None
+    
+    def get_percentile(self, score):
+        """Get the percentage of recorded games that scored lower"""
+        return self.leaderboard.percentile(score)
     
     def get_top_scores(self, limit=10):
         """Get top N high scores"""
-        return self.high_scores[:limit]
+        return self.leaderboard.top(limit)
 
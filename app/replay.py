@@ -0,0 +1,313 @@
+"""
+Compact binary replays
+Records the seeds plus the action/tick stream of a game and re-simulates it
+"""
+
+import argparse
+import copy
+import queue
+import struct
+import threading
+from .config import REPLAY_FLUSH_BYTES, REPLAY_CHECKPOINT_INTERVAL
+from .engine.core import Engine
+
+# File layout:
+#   header  - magic, version, num_players, board width/height, randomizer
+#             mode, preview pieces, then one u64 seed per player
+#   events  - one byte each, in the order Engine saw them:
+#     0x00-0x7F  action: (player_index << 3) | action
+#     0x80-0xBF  repeat the previous tick dt ((byte & 0x3F) + 1) times
+#     0xC0       tick with a new dt, followed by the dt as a varint
+# Actions are timestamped by the ticks around them, so a game at a steady
+# frame rate costs about one byte per action plus one byte per 64 frames.
+MAGIC = b'TRPL'
+# Version 2: gravity carries leftover time over between ticks
+VERSION = 2
+HEADER = struct.Struct('<4sBBBBBB')
+SEED = struct.Struct('<Q')
+
+TICK_REPEAT = 0x80
+TICK_NEW = 0xC0
+MAX_REPEAT = 64
+# Action bytes hold the player index in 4 bits, below the tick codes
+MAX_PLAYERS = TICK_REPEAT >> 3
+
+MODES = ('random', 'bag')
+_MASK64 = (1 << 64) - 1
+
+
+def _encode_varint(value):
+    """Encode a non-negative int as LEB128"""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint(data, offset):
+    """Decode a LEB128 int, returning (value, new_offset)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class _FileWriter(threading.Thread):
+    """Background thread that writes queued chunks to a file"""
+    
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.file = open(path, 'wb')
+        self.chunks = queue.Queue()
+    
+    def run(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                break
+            self.file.write(chunk)
+        self.file.close()
+
+
+class ReplayRecorder:
+    """Records an engine's actions and ticks as a compact byte stream
+    
+    With a path, full buffers are handed to a background thread so the
+    frame loop never waits on disk, not even in close(); call wait() before
+    reading the file or exiting. Without one, the replay stays in memory
+    and is available from getvalue().
+    """
+    
+    def __init__(self, engine, path=None, flush_bytes=REPLAY_FLUSH_BYTES):
+        if engine.frame != 0:
+            raise ValueError("replays must start recording at frame 0")
+        if engine.num_players > MAX_PLAYERS:
+            raise ValueError(f"replays hold at most {MAX_PLAYERS} players, not {engine.num_players}")
+        
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.closed = False
+        self._buffer = bytearray()
+        self._chunks = []
+        self._last_dt = None
+        self._repeat = 0
+        self._writer = None
+        if path is not None:
+            self._writer = _FileWriter(path)
+            self._writer.start()
+        
+        first = engine.players[0]
+        self._buffer += HEADER.pack(
+            MAGIC,
+            VERSION,
+            engine.num_players,
+            engine.board_width,
+            engine.board_height,
+            MODES.index(first.randomizer_mode),
+            first.preview_pieces
+        )
+        for player in engine.players:
+            self._buffer += SEED.pack(player.randomizer.seed & _MASK64)
+    
+    def _flush_repeat(self):
+        """Emit pending repeated ticks"""
+        if self._repeat:
+            self._buffer.append(TICK_REPEAT | (self._repeat - 1))
+            self._repeat = 0
+    
+    def _maybe_flush(self):
+        """Hand the buffer off once it is big enough"""
+        if len(self._buffer) >= self.flush_bytes:
+            self.flush()
+    
+    def record_action(self, player_index, action):
+        """Record an action dispatched to a player"""
+        self._flush_repeat()
+        self._buffer.append((player_index << 3) | action)
+        self._maybe_flush()
+    
+    def record_tick(self, dt):
+        """Record one Engine.update(dt) call"""
+        dt = int(dt)
+        if dt == self._last_dt:
+            self._repeat += 1
+            if self._repeat == MAX_REPEAT:
+                self._flush_repeat()
+        else:
+            self._flush_repeat()
+            self._buffer.append(TICK_NEW)
+            self._buffer += _encode_varint(dt)
+            self._last_dt = dt
+        self._maybe_flush()
+    
+    def flush(self):
+        """Move buffered bytes to the writer thread (or the in-memory list)"""
+        if not self._buffer:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        if self._writer is not None:
+            self._writer.chunks.put(chunk)
+        else:
+            self._chunks.append(chunk)
+    
+    def close(self):
+        """Finish the replay without waiting; the writer thread closes the file"""
+        if self.closed:
+            return
+        self.closed = True
+        self._flush_repeat()
+        self.flush()
+        if self._writer is not None:
+            self._writer.chunks.put(None)
+    
+    def wait(self):
+        """Block until a closed replay's file is completely written"""
+        if self._writer is not None:
+            self._writer.join()
+    
+    def getvalue(self):
+        """Get the recorded bytes (in-memory recorders only)"""
+        return b''.join(self._chunks) + bytes(self._buffer)
+
+
+class ReplayPlayer:
+    """Re-simulates a replay on a headless engine, with seeking
+    
+    data can be any buffer (bytes, mmap slice, memoryview); it is read in
+    place without copying.
+    """
+    
+    def __init__(self, data, checkpoint_interval=REPLAY_CHECKPOINT_INTERVAL):
+        self.data = memoryview(data)
+        self.checkpoint_interval = checkpoint_interval
+        
+        magic, version, num_players, width, height, mode, preview = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        
+        self.num_players = num_players
+        self.board_width = width
+        self.board_height = height
+        self.randomizer_mode = MODES[mode]
+        self.preview_pieces = preview
+        self.seeds = [
+            SEED.unpack_from(self.data, HEADER.size + i * SEED.size)[0]
+            for i in range(num_players)
+        ]
+        self._events_start = HEADER.size + num_players * SEED.size
+        self._checkpoints = []
+        self.restart()
+    
+    @property
+    def frame(self):
+        """Number of ticks applied so far"""
+        return self.engine.frame
+    
+    def restart(self):
+        """Rewind to the start of the replay"""
+        engine = Engine(self.num_players, self.board_width, self.board_height)
+        for player, seed in zip(engine.players, self.seeds):
+            player.randomizer_mode = self.randomizer_mode
+            player.preview_pieces = self.preview_pieces
+            player.reset(seed)
+        self.engine = engine
+        self._offset = self._events_start
+        self._last_dt = 0
+        self._pending_ticks = 0
+    
+    def finished(self):
+        """Check if every event has been played"""
+        return self._pending_ticks == 0 and self._offset >= len(self.data)
+    
+    def step(self):
+        """Play events up to and including the next tick; False at the end"""
+        data = self.data
+        engine = self.engine
+        while self._pending_ticks == 0:
+            if self._offset >= len(data):
+                return False
+            byte = data[self._offset]
+            self._offset += 1
+            if byte < TICK_REPEAT:
+                engine.apply_action(byte >> 3, byte & 0x07)
+            elif byte < TICK_NEW:
+                self._pending_ticks = (byte & 0x3F) + 1
+            elif byte == TICK_NEW:
+                self._last_dt, self._offset = _decode_varint(data, self._offset)
+                self._pending_ticks = 1
+            else:
+                raise ValueError(f"bad replay event 0x{byte:02x}")
+        
+        self._pending_ticks -= 1
+        engine.update(self._last_dt)
+        
+        if self.checkpoint_interval and engine.frame % self.checkpoint_interval == 0:
+            if not self._checkpoints or self._checkpoints[-1][0] < engine.frame:
+                self._checkpoints.append(self._save_state())
+        return True
+    
+    def run(self):
+        """Play to the end as fast as possible and return the engine"""
+        while self.step():
+            pass
+        return self.engine
+    
+    def seek(self, frame):
+        """Move to the state right after the given number of ticks"""
+        if frame < self.engine.frame:
+            self._restore_before(frame)
+        while self.engine.frame < frame and self.step():
+            pass
+        return self.engine
+    
+    def _save_state(self):
+        return (
+            self.engine.frame,
+            copy.deepcopy(self.engine),
+            self._offset,
+            self._last_dt,
+            self._pending_ticks
+        )
+    
+    def _restore_before(self, frame):
+        """Jump to the latest checkpoint at or before frame"""
+        best = None
+        for checkpoint in self._checkpoints:
+            if checkpoint[0] <= frame:
+                best = checkpoint
+        if best is None:
+            self.restart()
+            return
+        _, engine, self._offset, self._last_dt, self._pending_ticks = best
+        self.engine = copy.deepcopy(engine)
+
+
+def main():
+    """Play back a replay file headlessly and print the final result"""
+    parser = argparse.ArgumentParser(description="Re-simulate a Tetris replay")
+    parser.add_argument('path')
+    args = parser.parse_args()
+    
+    with open(args.path, 'rb') as f:
+        engine = ReplayPlayer(f.read()).run()
+    print(f"{engine.frame} frames")
+    for player in engine.players:
+        print(f"Player {player.player_id}: {player.score} points, "
+              f"level {player.level}, {player.lines_cleared} lines")
+
+
+if __name__ == "__main__":
+    main()
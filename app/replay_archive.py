@@ -0,0 +1,228 @@
+"""
+Replay archive
+Packs many replays into one file with a fixed-width, mmap-readable index
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from collections import namedtuple
+from .replay import ReplayPlayer
+
+# File layout:
+#   header  - magic, version, entry count, index offset (32 bytes)
+#   data    - replay records back to back
+#   index   - one fixed-width entry per replay, in insertion order
+# Appending writes the new replays and a new full index after the old
+# index and patches the header last, so a crash midway leaves the old
+# archive intact; each append leaves its predecessor's index as dead bytes.
+MAGIC = b'TRPA'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQQ8x')
+INDEX_ENTRY = struct.Struct('<QQQQIHBx')
+
+# Byte offset of the score field inside an index entry
+_SCORE_OFFSET = 24
+
+# Final stats are those of player 1
+ArchiveEntry = namedtuple(
+    'ArchiveEntry',
+    ['offset', 'length', 'seed', 'score', 'lines', 'level', 'num_players']
+)
+
+
+class ReplayArchiveWriter:
+    """Appends replays to an archive file; the index is written on close"""
+    
+    def __init__(self, path, append=False):
+        self.path = path
+        self.entries = []
+        
+        if append:
+            with ReplayArchive(path) as existing:
+                self.entries = [existing.entry(i) for i in range(len(existing))]
+            self.file = open(path, 'r+b')
+            self.file.seek(0, os.SEEK_END)
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def add(self, replay, score=None, lines=None, level=None):
+        """Append replay bytes, returning the new replay's index
+        
+        Final stats are computed by re-simulating the replay unless all of
+        score, lines and level are given.
+        """
+        player = ReplayPlayer(replay, checkpoint_interval=0)
+        if score is None or lines is None or level is None:
+            first = player.run().players[0]
+            score, lines, level = first.score, first.lines_cleared, first.level
+        
+        offset = self.file.tell()
+        self.file.write(replay)
+        self.entries.append(ArchiveEntry(
+            offset,
+            len(replay),
+            player.seeds[0],
+            score,
+            lines,
+            level,
+            player.num_players
+        ))
+        return len(self.entries) - 1
+    
+    def close(self):
+        """Write the index and patch the header"""
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        for entry in self.entries:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        # The new replays and index must be on disk before the header
+        # points at them
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(self.entries), index_offset))
+        self.file.close()
+
+
+class ReplayArchive:
+    """Read-only, memory-mapped view of a replay archive"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, count, index_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError("not a replay archive")
+        if version != VERSION:
+            raise ValueError(f"unsupported archive version {version}")
+        
+        self.count = count
+        self.index_offset = index_offset
+        self._view = memoryview(self._mmap)
+        self._index = self._view[index_offset:index_offset + count * INDEX_ENTRY.size]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __len__(self):
+        return self.count
+    
+    def close(self):
+        """Release the mapping and the file
+        
+        Views from replay() and the players built on them keep the mapping
+        alive; release them first to unmap it here, otherwise it is unmapped
+        once the last of them is garbage collected.
+        """
+        self._index.release()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Replay views are still exported
+            pass
+        self._file.close()
+    
+    def entry(self, index):
+        """Get the index entry for replay number `index`"""
+        if not 0 <= index < self.count:
+            raise IndexError("replay index out of range")
+        return ArchiveEntry(*INDEX_ENTRY.unpack_from(self._index, index * INDEX_ENTRY.size))
+    
+    def replay(self, index):
+        """Get replay bytes as a zero-copy memoryview into the archive (valid
+        until released, even after close)"""
+        entry = self.entry(index)
+        return self._view[entry.offset:entry.offset + entry.length]
+    
+    def player(self, index):
+        """Get a ReplayPlayer streaming straight from the mapped archive"""
+        return ReplayPlayer(self.replay(index))
+    
+    def entries(self):
+        """Iterate over all index entries"""
+        for fields in INDEX_ENTRY.iter_unpack(self._index):
+            yield ArchiveEntry(*fields)
+    
+    def scores(self):
+        """Iterate over final scores, reading only the score field"""
+        unpack = struct.Struct('<Q').unpack_from
+        for offset in range(_SCORE_OFFSET, len(self._index), INDEX_ENTRY.size):
+            yield unpack(self._index, offset)[0]
+    
+    def find(self, min_score=None, max_score=None, min_level=None, min_lines=None):
+        """Get indices of replays matching the filters, using only the index"""
+        if min_level is None and min_lines is None:
+            low = 0 if min_score is None else min_score
+            return [
+                i for i, score in enumerate(self.scores())
+                if score >= low and (max_score is None or score <= max_score)
+            ]
+        
+        return [
+            i for i, entry in enumerate(self.entries())
+            if (min_score is None or entry.score >= min_score)
+            and (max_score is None or entry.score <= max_score)
+            and (min_level is None or entry.level >= min_level)
+            and (min_lines is None or entry.lines >= min_lines)
+        ]
+
+
+def main():
+    """Pack replays into an archive, query it, or play one back"""
+    parser = argparse.ArgumentParser(description="Tetris replay archives")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    pack = commands.add_parser('pack', help="add replay files to an archive")
+    pack.add_argument('archive')
+    pack.add_argument('replays', nargs='+')
+    pack.add_argument('--append', action='store_true')
+    
+    query = commands.add_parser('query', help="list replays matching filters")
+    query.add_argument('archive')
+    query.add_argument('--min-score', type=int)
+    query.add_argument('--min-level', type=int)
+    query.add_argument('--min-lines', type=int)
+    
+    play = commands.add_parser('play', help="re-simulate one replay")
+    play.add_argument('archive')
+    play.add_argument('index', type=int)
+    args = parser.parse_args()
+    
+    if args.command == 'pack':
+        with ReplayArchiveWriter(args.archive, append=args.append) as writer:
+            for path in args.replays:
+                with open(path, 'rb') as f:
+                    writer.add(f.read())
+        print(f"{len(writer.entries)} replays in {args.archive}")
+    elif args.command == 'query':
+        with ReplayArchive(args.archive) as archive:
+            for i in archive.find(args.min_score, None, args.min_level, args.min_lines):
+                entry = archive.entry(i)
+                print(f"#{i}: score {entry.score}, level {entry.level}, "
+                      f"{entry.lines} lines, seed {entry.seed}")
+    else:
+        with ReplayArchive(args.archive) as archive:
+            engine = archive.player(args.index).run()
+            for player in engine.players:
+                print(f"Player {player.player_id}: {player.score} points, "
+                      f"level {player.level}, {player.lines_cleared} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Durable high-score storage
+Append-only journal plus an atomically replaced snapshot, written by a
+background thread and shared between processes through a lock file
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from .config import SCORE_JOURNAL_COMPACT_BYTES
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on path (created if missing) across processes"""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _fsync_dir(path):
+    """Make a rename in path's directory durable (no-op where unsupported)"""
+    if fcntl is None:
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _unique(entries):
+    """Drop repeated entries (same id), keeping the first"""
+    seen = set()
+    unique = []
+    for entry in entries:
+        entry_id = entry.get('id')
+        if entry_id is not None:
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+        unique.append(entry)
+    return unique
+
+
+class ScoreStore:
+    """Score entries kept in a JSON snapshot plus an append-only journal
+    
+    path holds the snapshot and path + '.journal' one JSON entry per line.
+    The snapshot is written one entry per line too, so reading it is a loop
+    of small parses another thread can interleave with; an older snapshot
+    holding a single JSON list is still read. New entries are appended to
+    the journal; once it grows past compact_bytes, and past the size of the
+    snapshot, it is folded into a new snapshot written to a temp file and
+    swapped in with os.replace, so a crash at any point leaves a readable
+    store. Tying the threshold to the snapshot size keeps the total bytes
+    rewritten by compactions proportional to the bytes ever added. Every
+    entry carries an 'id', so entries present in both files after an
+    interrupted compaction are only loaded once.
+    """
+    
+    def __init__(self, path, compact_bytes=SCORE_JOURNAL_COMPACT_BYTES):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.lock_path = path + '.lock'
+        self.compact_bytes = compact_bytes
+        # Set when the snapshot could not be parsed and was moved aside
+        self.recovered_from = None
+        
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+    
+    def load(self):
+        """Read every stored entry (snapshot first, then the journal)"""
+        with _file_lock(self.lock_path):
+            return _unique(self._read_snapshot() + self._read_journal())
+    
+    def _read_snapshot(self):
+        """Parse the snapshot; a corrupt one is kept aside, never overwritten"""
+        try:
+            with open(self.path, 'rb') as f:
+                start = f.read(64).lstrip()
+                f.seek(0)
+                if start.startswith(b'['):
+                    # Snapshot from before the one-entry-per-line format
+                    entries = json.load(f)
+                    if not isinstance(entries, list):
+                        raise ValueError("snapshot is not a list")
+                else:
+                    entries = [json.loads(line) for line in f if line.strip()]
+            if not all(isinstance(entry, dict) for entry in entries):
+                raise ValueError("snapshot entries must be objects")
+            return entries
+        except FileNotFoundError:
+            return []
+        except ValueError:
+            self.recovered_from = f"{self.path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+            os.replace(self.path, self.recovered_from)
+            return []
+    
+    def _read_journal(self):
+        """Parse journal lines, skipping a torn final line from a crash"""
+        entries = []
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    def append(self, entry):
+        """Queue an entry for writing and return it with its id; never blocks on disk"""
+        entry = dict(entry)
+        entry.setdefault('id', uuid.uuid4().hex)
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+        self._queue.put(entry)
+        return entry
+    
+    def _write_loop(self):
+        """Background thread: append queued entries to the journal"""
+        while True:
+            entry = self._queue.get()
+            try:
+                if entry is None:
+                    return
+                self._write(entry)
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, entry):
+        """Append one entry durably, compacting if the journal got too big"""
+        data = json.dumps(entry).encode() + b'\n'
+        with _file_lock(self.lock_path):
+            with open(self.journal_path, 'ab') as f:
+                self._drop_torn_tail(f)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            if size >= max(self.compact_bytes, self._snapshot_size()):
+                self._compact_locked()
+    
+    def _snapshot_size(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+    
+    def _drop_torn_tail(self, f):
+        """Cut a partial last line (from a crash mid-append) off the journal"""
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        with open(self.journal_path, 'rb') as reader:
+            reader.seek(size - 1)
+            if reader.read(1) == b'\n':
+                return
+            reader.seek(0)
+            end = reader.read().rfind(b'\n') + 1
+        f.truncate(end)
+    
+    def compact(self):
+        """Fold the journal into a new snapshot now"""
+        self.flush()
+        with _file_lock(self.lock_path):
+            self._compact_locked()
+    
+    def _compact_locked(self):
+        """Write snapshot + journal to a temp file, swap it in, then drop the journal"""
+        unique = _unique(self._read_snapshot() + self._read_journal())
+        
+        temp_path = f"{self.path}.tmp-{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.writelines(json.dumps(entry).encode() + b'\n' for entry in unique)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        _fsync_dir(self.path)
+        # Entries in the journal are now in the snapshot too; if we crash
+        # before this, their ids keep them from loading twice
+        with open(self.journal_path, 'wb') as f:
+            os.fsync(f.fileno())
+    
+    def flush(self):
+        """Wait until every queued entry is on disk"""
+        self._queue.join()
+    
+    def close(self):
+        """Flush and stop the writer thread"""
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join()
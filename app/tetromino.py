@@ -3,6 +3,7 @@ Tetromino piece definitions and rotation logic
 Contains all 7 standard Tetris pieces
 """
 
+from collections import namedtuple
 from .config import COLORS
 
 # Tetromino shapes defined as 4x4 grids
@@ -119,17 +120,71 @@ SHAPES = {
 }
 
 
+# Immutable per-rotation data compiled from SHAPES
+#   blocks   - (x, y) offsets of the four cells within the 5x5 grid
+#   min_x .. max_y - bounding box of those cells
+#   bottom   - (x, lowest y) for every occupied column, left to right
+#   row_masks - (y, bitmask of occupied x) for every occupied row, top to bottom
+RotationTable = namedtuple(
+    'RotationTable',
+    ['blocks', 'min_x', 'max_x', 'min_y', 'max_y', 'bottom', 'row_masks']
+)
+
+
+def _compile_rotation(grid):
+    """Build a RotationTable from one 5x5 string grid"""
+    blocks = tuple(
+        (x, y)
+        for y, row in enumerate(grid)
+        for x, cell in enumerate(row)
+        if cell == '#'
+    )
+    xs = [x for x, _ in blocks]
+    ys = [y for _, y in blocks]
+    
+    bottom = {}
+    row_masks = {}
+    for x, y in blocks:
+        bottom[x] = max(bottom.get(x, y), y)
+        row_masks[y] = row_masks.get(y, 0) | (1 << x)
+    
+    return RotationTable(
+        blocks=blocks,
+        min_x=min(xs),
+        max_x=max(xs),
+        min_y=min(ys),
+        max_y=max(ys),
+        bottom=tuple(sorted(bottom.items())),
+        row_masks=tuple(sorted(row_masks.items()))
+    )
+
+
+# Rotation tables for every shape, compiled once at import
+SHAPE_TABLES = {
+    shape_type: tuple(_compile_rotation(grid) for grid in rotations)
+    for shape_type, rotations in SHAPES.items()
+}
+
+
 class Tetromino:
     """Represents a Tetromino piece"""
     
+    __slots__ = ('shape_type', 'color', 'rotations', 'tables', 'rotation_index', 'x', 'y')
+    
     def __init__(self, shape_type):
         self.shape_type = shape_type
         self.color = COLORS[shape_type]
         self.rotations = SHAPES[shape_type]
+        self.tables = SHAPE_TABLES[shape_type]
         self.rotation_index = 0
         self.x = 0
         self.y = 0
     
+    @property
+    def table(self):
+        """Get the precompiled table for the current rotation"""
+        return self.tables[self.rotation_index]
+    
     def get_shape(self):
         """Get current rotation of the piece"""
         return self.rotations[self.rotation_index]
@@ -137,30 +192,28 @@ class Tetromino:
     def rotate(self, clockwise=True):
         """Rotate the piece"""
         if clockwise:
-            self.rotation_index = (self.rotation_index + 1) % len(self.rotations)
+            self.rotation_index = (self.rotation_index + 1) % len(self.tables)
         else:
-            self.rotation_index = (self.rotation_index - 1) % len(self.rotations)
+            self.rotation_index = (self.rotation_index - 1) % len(self.tables)
     
     def get_blocks(self):
-        """Get list of (x, y) positions relative to piece position"""
-        shape = self.get_shape()
-        blocks = []
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell == '#':
-                    blocks.append((x, y))
-        return blocks
+        """Get tuple of (x, y) positions relative to piece position"""
+        return self.tables[self.rotation_index].blocks
     
     def get_absolute_blocks(self):
         """Get list of (x, y) positions in board coordinates"""
-        blocks = self.get_blocks()
-        return [(self.x + bx, self.y + by) for bx, by in blocks]
+        x = self.x
+        y = self.y
+        return [(x + bx, y + by) for bx, by in self.tables[self.rotation_index].blocks]
     
     def copy(self):
-        """Create a copy of this tetromino"""
-        new = Tetromino(self.shape_type)
+        """Create a copy of this tetromino sharing the same shape tables"""
+        new = Tetromino.__new__(Tetromino)
+        new.shape_type = self.shape_type
+        new.color = self.color
+        new.rotations = self.rotations
+        new.tables = self.tables
         new.rotation_index = self.rotation_index
         new.x = self.x
         new.y = self.y
         return new
-
@@ -0,0 +1,96 @@
+"""
+Shared font and text render cache
+Loads each font size once and renders each (font, text, color) once
+"""
+
+from collections import OrderedDict
+import pygame
+from .config import TEXT_CACHE_SIZE
+
+# Shared default fonts, keyed by size
+_fonts = {}
+_shared_cache = None
+
+
+def get_font(size):
+    """Get the shared default font at the given size"""
+    font = _fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            # main only initializes the display; fonts start on first use
+            pygame.font.init()
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+class LazyFont:
+    """Class attribute that loads a shared font the first time it is read
+    
+    The font is then stored on the instance, so later reads are plain
+    attribute lookups.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self.name = None
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        font = get_font(self.size)
+        instance.__dict__[self.name] = font
+        return font
+
+
+def get_text_cache():
+    """Get the text cache shared by the menu and the UI"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TextCache()
+    return _shared_cache
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces"""
+    
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+    
+    def render(self, font, text, color, antialias=True):
+        """Get the rendered surface for text, rendering it on first use"""
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def stats(self):
+        """Get hit/miss counts for the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._surfaces),
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
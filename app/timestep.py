@@ -0,0 +1,43 @@
+"""
+Fixed-timestep scheduler
+Turns variable render frame times into a whole number of fixed simulation steps
+"""
+
+from .config import SIMULATION_STEP_MS, MAX_SIMULATION_STEPS
+
+
+class FixedTimestep:
+    """Accumulates frame time and hands it out in fixed-size steps
+    
+    The simulation then advances the same way at any render rate; leftover
+    time stays in the accumulator for the next frame.
+    """
+    
+    def __init__(self, step_ms=SIMULATION_STEP_MS, max_steps=MAX_SIMULATION_STEPS):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.accumulator = 0
+        # Time skipped because a frame fell more than max_steps behind
+        self.dropped_ms = 0
+    
+    def reset(self):
+        """Forget accumulated time (e.g. when a new game starts)"""
+        self.accumulator = 0
+    
+    def advance(self, frame_ms):
+        """Add one frame's elapsed time and get how many steps to simulate"""
+        self.accumulator += frame_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # Too far behind (window drag, debugger): skip the backlog
+            # instead of spending ever longer frames catching up
+            self.dropped_ms += (steps - self.max_steps) * self.step_ms
+            self.accumulator -= (steps - self.max_steps) * self.step_ms
+            steps = self.max_steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+    
+    @property
+    def alpha(self):
+        """Fraction of a step left in the accumulator (for interpolation)"""
+        return self.accumulator / self.step_ms
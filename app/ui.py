@@ -3,30 +3,57 @@ UI rendering functions for Tetris game
 Handles drawing game boards, pieces, scores, and rankings
 """
 
+import weakref
 import pygame
 from .config import *
+from .text_cache import LazyFont, get_text_cache
 
 
 class UI:
     """UI rendering class"""
     
-    def __init__(self, screen):
+    # Loaded on first use, shared with the menu
+    font_large = LazyFont(FONT_SIZE_LARGE)
+    font_medium = LazyFont(FONT_SIZE_MEDIUM)
+    font_small = LazyFont(FONT_SIZE_SMALL)
+    font_tiny = LazyFont(FONT_SIZE_TINY)
+    
+    def __init__(self, screen, text_cache=None):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, FONT_SIZE_LARGE)
-        self.font_medium = pygame.font.Font(None, FONT_SIZE_MEDIUM)
-        self.font_small = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self.text_cache = text_cache or get_text_cache()
+        
+        # Pre-rendered board background + grid, keyed by (width, height)
+        self._board_backgrounds = {}
+        # Per-player locked-cells layer: player -> ((board_version, width, height), surface)
+        self._board_layers = weakref.WeakKeyDictionary()
+        
+        # Dirty-rect state for the game screens
+        self.dirty_rects = []
+        self._layout = None
+        self._section_keys = {}
+        
+        # Game-over screen: the dimming overlay is built once, and the
+        # finished frame is kept until the players or scores change
+        self._dim_overlay = None
+        self._game_over_frame = None
+        
+        # Party-mode tile grid per board count: (columns, cell size)
+        self._tile_grids = {}
     
-    def draw_board(self, player, x, y, width=None, height=None):
-        """Draw a player's game board"""
-        if width is None:
-            width = BOARD_WIDTH * CELL_SIZE
-        if height is None:
-            height = BOARD_HEIGHT * CELL_SIZE
+    def invalidate(self):
+        """Force the next game frame to redraw the whole screen"""
+        self._layout = None
+    
+    def _board_background(self, width, height):
+        """Get the cached board background with border and grid lines"""
+        surface = self._board_backgrounds.get((width, height))
+        if surface is not None:
+            return surface
         
-        # Draw board background
-        board_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(self.screen, BOARD_BG, board_rect)
-        pygame.draw.rect(self.screen, BOARD_BORDER, board_rect, 2)
+        surface = pygame.Surface((width, height))
+        board_rect = surface.get_rect()
+        pygame.draw.rect(surface, BOARD_BG, board_rect)
+        pygame.draw.rect(surface, BOARD_BORDER, board_rect, 2)
         
         # Draw grid
         cell_w = width // BOARD_WIDTH
@@ -34,31 +61,99 @@ class UI:
         
         for i in range(BOARD_WIDTH + 1):
             pygame.draw.line(
-                self.screen,
+                surface,
                 BOARD_GRID,
-                (x + i * cell_w, y),
-                (x + i * cell_w, y + height)
+                (i * cell_w, 0),
+                (i * cell_w, height)
             )
         
         for i in range(BOARD_HEIGHT + 1):
             pygame.draw.line(
-                self.screen,
+                surface,
                 BOARD_GRID,
-                (x, y + i * cell_h),
-                (x + width, y + i * cell_h)
+                (0, i * cell_h),
+                (width, i * cell_h)
             )
         
+        self._board_backgrounds[(width, height)] = surface
+        return surface
+    
+    def _board_layer(self, player, width, height):
+        """Get the player's background + locked cells, rebuilt only after a lock"""
+        key = (player.board_version, width, height)
+        cached = self._board_layers.get(player)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        surface = self._board_background(width, height).copy()
+        cell_w = width // BOARD_WIDTH
+        cell_h = height // BOARD_HEIGHT
+        
         # Draw placed blocks
         for by in range(BOARD_HEIGHT):
+            row = player.board[by]
             for bx in range(BOARD_WIDTH):
-                if player.board[by][bx] != 0:
+                if row[bx] != 0:
                     rect = pygame.Rect(
-                        x + bx * cell_w + 1,
-                        y + by * cell_h + 1,
+                        bx * cell_w + 1,
+                        by * cell_h + 1,
                         cell_w - 2,
                         cell_h - 2
                     )
-                    pygame.draw.rect(self.screen, player.board[by][bx], rect)
+                    pygame.draw.rect(surface, row[bx], rect)
+        
+        self._board_layers[player] = (key, surface)
+        return surface
+    
+    def _draw_sections(self, layout, sections):
+        """Draw (name, rect, key, draw) sections, redrawing only changed ones
+        
+        Changed sections are repainted with the screen clipped to their rect,
+        together with any other section overlapping it, and their rects are
+        collected in self.dirty_rects for pygame.display.update.
+        """
+        if layout != self._layout:
+            self._layout = layout
+            self._section_keys = {}
+            self.screen.fill(BLACK)
+            for _, _, _, draw in sections:
+                draw()
+            self.dirty_rects = [self.screen.get_rect()]
+        else:
+            self.dirty_rects = [
+                rect for name, rect, key, _ in sections
+                if self._section_keys.get(name) != key
+            ]
+            for dirty in self.dirty_rects:
+                self.screen.set_clip(dirty)
+                self.screen.fill(BLACK)
+                for _, rect, _, draw in sections:
+                    if rect.colliderect(dirty):
+                        draw()
+            self.screen.set_clip(None)
+        
+        for name, _, key, _ in sections:
+            self._section_keys[name] = key
+    
+    def draw_board(self, player, x, y, width=None, height=None):
+        """Draw a player's game board"""
+        if width is None:
+            width = BOARD_WIDTH * CELL_SIZE
+        if height is None:
+            height = BOARD_HEIGHT * CELL_SIZE
+        
+        # Draw cached background, grid and locked cells
+        self.screen.blit(self._board_layer(player, width, height), (x, y))
+        cell_w = width // BOARD_WIDTH
+        cell_h = height // BOARD_HEIGHT
+        
+        # Draw ghost piece where the current piece would land
+        if player.current_piece and not player.game_over:
+            self._draw_ghost(
+                player.current_piece,
+                player.ghost_y(),
+                x, y, cell_w, cell_h
+            )
         
         # Draw current piece
         if player.current_piece:
@@ -78,9 +173,20 @@ class UI:
             pygame.draw.rect(self.screen, piece.color, rect)
             pygame.draw.rect(self.screen, WHITE, rect, 1)
     
+    def _draw_ghost(self, piece, ghost_y, board_x, board_y, cell_w, cell_h):
+        """Draw the outline of a piece at its landing row"""
+        for bx, by in piece.get_blocks():
+            if ghost_y + by < 0:
+                continue
+            x = board_x + (piece.x + bx) * cell_w + 1
+            y = board_y + (ghost_y + by) * cell_h + 1
+            
+            rect = pygame.Rect(x, y, cell_w - 2, cell_h - 2)
+            pygame.draw.rect(self.screen, COLORS['GHOST'], rect, 2)
+    
     def draw_next_piece(self, piece, x, y):
         """Draw next piece preview"""
-        label = self.font_small.render("Next:", True, WHITE)
+        label = self.text_cache.render(self.font_small, "Next:", WHITE)
         self.screen.blit(label, (x, y))
         
         preview_y = y + 30
@@ -101,22 +207,22 @@ class UI:
         info_y = y
         
         # Player label
-        label = self.font_medium.render(f"Player {player.player_id}", True, WHITE)
+        label = self.text_cache.render(self.font_medium, f"Player {player.player_id}", WHITE)
         self.screen.blit(label, (x, info_y))
         info_y += 35
         
         # Score
-        score_text = self.font_small.render(f"Score: {player.score}", True, WHITE)
+        score_text = self.text_cache.render(self.font_small, f"Score: {player.score}", WHITE)
         self.screen.blit(score_text, (x, info_y))
         info_y += 25
         
         # Level
-        level_text = self.font_small.render(f"Level: {player.level}", True, WHITE)
+        level_text = self.text_cache.render(self.font_small, f"Level: {player.level}", WHITE)
         self.screen.blit(level_text, (x, info_y))
         info_y += 25
         
         # Lines cleared
-        lines_text = self.font_small.render(f"Lines: {player.lines_cleared}", True, WHITE)
+        lines_text = self.text_cache.render(self.font_small, f"Lines: {player.lines_cleared}", WHITE)
         self.screen.blit(lines_text, (x, info_y))
     
     def draw_ranking(self, players, x, y, is_game_over=False):
@@ -127,7 +233,7 @@ class UI:
         # Title
         if len(players) > 1:
             title = "Ranking"
-            title_text = self.font_medium.render(title, True, WHITE)
+            title_text = self.text_cache.render(self.font_medium, title, WHITE)
             self.screen.blit(title_text, (x, y))
             y += 35
             
@@ -139,13 +245,13 @@ class UI:
                 color = WHITE if not is_game_over else (255, 215, 0) if rank == 1 else WHITE
                 
                 rank_text = f"{rank}. Player {player.player_id}: {player.score}"
-                text = self.font_small.render(rank_text, True, color)
+                text = self.text_cache.render(self.font_small, rank_text, color)
                 self.screen.blit(text, (x, y))
                 y += 25
         else:
             # Single player - show current score prominently with background box
             title = "Current Score"
-            title_text = self.font_medium.render(title, True, WHITE)
+            title_text = self.text_cache.render(self.font_medium, title, WHITE)
             title_rect = title_text.get_rect()
             
             # Draw background box for current score
@@ -160,18 +266,18 @@ class UI:
             
             player = players[0]
             score_text = f"{player.score}"
-            text = self.font_small.render(score_text, True, WHITE)
+            text = self.text_cache.render(self.font_small, score_text, WHITE)
             self.screen.blit(text, (x, y))
     
     def draw_high_scores(self, high_scores, x, y):
         """Draw high scores list"""
-        title = self.font_medium.render("High Scores", True, WHITE)
+        title = self.text_cache.render(self.font_medium, "High Scores", WHITE)
         self.screen.blit(title, (x, y))
         y += 35
         
         for i, entry in enumerate(high_scores[:5]):
             score_text = f"{i+1}. {entry['score']} (Lv{entry['level']}, {entry['lines']} lines)"
-            text = self.font_small.render(score_text, True, WHITE)
+            text = self.text_cache.render(self.font_small, score_text, WHITE)
             self.screen.blit(text, (x, y))
             y += 25
     
@@ -180,7 +286,7 @@ class UI:
         self.screen.fill(BLACK)
         
         # Title
-        title = self.font_large.render("RANKINGS", True, WHITE)
+        title = self.text_cache.render(self.font_large, "RANKINGS", WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 50))
         self.screen.blit(title, title_rect)
         
@@ -189,7 +295,7 @@ class UI:
         
         if not high_scores:
             # No scores yet
-            no_scores = self.font_medium.render("No scores yet!", True, GRAY)
+            no_scores = self.text_cache.render(self.font_medium, "No scores yet!", GRAY)
             no_scores_rect = no_scores.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(no_scores, no_scores_rect)
         else:
@@ -208,7 +314,7 @@ class UI:
             ]
             
             for i, header in enumerate(headers):
-                header_text = self.font_medium.render(header, True, (255, 255, 0))
+                header_text = self.text_cache.render(self.font_medium, header, (255, 255, 0))
                 self.screen.blit(header_text, (header_x_positions[i], header_y))
             
             # Draw separator line
@@ -232,139 +338,270 @@ class UI:
                     color = WHITE
                 
                 # Rank
-                rank_text = self.font_small.render(f"{rank}.", True, color)
+                rank_text = self.text_cache.render(self.font_small, f"{rank}.", color)
                 self.screen.blit(rank_text, (header_x_positions[0], y))
                 
                 # Score
-                score_text = self.font_small.render(str(entry['score']), True, color)
+                score_text = self.text_cache.render(self.font_small, str(entry['score']), color)
                 self.screen.blit(score_text, (header_x_positions[1], y))
                 
                 # Level
-                level_text = self.font_small.render(f"Lv{entry['level']}", True, color)
+                level_text = self.text_cache.render(self.font_small, f"Lv{entry['level']}", color)
                 self.screen.blit(level_text, (header_x_positions[2], y))
                 
                 # Lines
-                lines_text = self.font_small.render(str(entry['lines']), True, color)
+                lines_text = self.text_cache.render(self.font_small, str(entry['lines']), color)
                 self.screen.blit(lines_text, (header_x_positions[3], y))
         
         # Instructions
-        instruction = self.font_small.render("Press ESC to return to menu", True, GRAY)
+        instruction = self.text_cache.render(self.font_small, "Press ESC to return to menu", GRAY)
         instruction_rect = instruction.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
         self.screen.blit(instruction, instruction_rect)
     
     def draw_game_over(self, players, ranking_system):
-        """Draw game over screen"""
+        """Draw game over screen over the last game frame"""
+        key = tuple((player, player.score) for player in players)
+        if self._game_over_frame is not None and self._game_over_frame[0] == key:
+            self.screen.blit(self._game_over_frame[1], (0, 0))
+            return
+        
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        if self._dim_overlay is None:
+            self._dim_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self._dim_overlay.set_alpha(200)
+            self._dim_overlay.fill(BLACK)
+        self.screen.blit(self._dim_overlay, (0, 0))
         
         # Game Over text
-        game_over_text = self.font_large.render("GAME OVER", True, WHITE)
+        game_over_text = self.text_cache.render(self.font_large, "GAME OVER", WHITE)
         text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
         self.screen.blit(game_over_text, text_rect)
         
-        # Final rankings
-        y = SCREEN_HEIGHT // 2 - 20
+        # Final rankings (in columns of six, smaller, when there are many players)
         ranked = sorted(players, key=lambda p: p.score, reverse=True)
+        if len(ranked) <= 4:
+            font, spacing, per_column, column_width = self.font_medium, 40, 4, 0
+        else:
+            font, spacing, per_column, column_width = self.font_small, 26, 6, 300
+        columns = (len(ranked) + per_column - 1) // per_column
+        first_x = SCREEN_WIDTH // 2 - (columns - 1) * column_width // 2
         
         for i, player in enumerate(ranked):
             rank = i + 1
             color = (255, 215, 0) if rank == 1 else WHITE
+            x = first_x + (i // per_column) * column_width
+            y = SCREEN_HEIGHT // 2 - 20 + (i % per_column) * spacing
             
             rank_text = f"{rank}. Player {player.player_id}: {player.score} points"
-            text = self.font_medium.render(rank_text, True, color)
-            text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, y))
+            text = self.text_cache.render(font, rank_text, color)
+            text_rect = text.get_rect(center=(x, y))
             self.screen.blit(text, text_rect)
-            y += 40
         
         # Press any key to continue
-        continue_text = self.font_small.render("Press ESC to return to menu", True, GRAY)
+        continue_text = self.text_cache.render(self.font_small, "Press ESC to return to menu", GRAY)
         text_rect = continue_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150))
         self.screen.blit(continue_text, text_rect)
+        
+        # Keep the finished frame so redraws don't dim it again
+        self._game_over_frame = (key, self.screen.copy())
+    
+    def _board_key(self, player):
+        """State that determines how a board looks"""
+        piece = player.current_piece
+        if piece is None:
+            return (player.board_version, player.game_over)
+        return (
+            player.board_version,
+            player.game_over,
+            piece.shape_type,
+            piece.rotation_index,
+            piece.x,
+            piece.y
+        )
+    
+    def _player_sections(self, player, board_x, board_y, info_x, info_y, next_x, next_y):
+        """Board, info and next-piece sections for one player"""
+        board_width = BOARD_WIDTH * CELL_SIZE
+        board_height = BOARD_HEIGHT * CELL_SIZE
+        name = f"p{player.player_id}"
+        return [
+            (
+                name + "_board",
+                pygame.Rect(board_x, board_y, board_width, board_height),
+                self._board_key(player),
+                lambda: self.draw_board(player, board_x, board_y)
+            ),
+            (
+                name + "_info",
+                pygame.Rect(info_x, info_y, 200, 110),
+                (player.score, player.level, player.lines_cleared),
+                lambda: self.draw_player_info(player, info_x, info_y)
+            ),
+            (
+                name + "_next",
+                pygame.Rect(next_x, next_y, 4 * CELL_SIZE, 30 + 5 * CELL_SIZE),
+                player.next_piece.shape_type if player.next_piece else None,
+                lambda: self.draw_next_piece(player.next_piece, next_x, next_y)
+            ),
+        ]
     
     def draw_1player_game(self, player, ranking_system):
         """Draw single player game screen"""
-        self.screen.fill(BLACK)
-        
         # Calculate board position (centered)
         board_width = BOARD_WIDTH * CELL_SIZE
         board_height = BOARD_HEIGHT * CELL_SIZE
         board_x = SCREEN_WIDTH // 2 - board_width // 2 - 150
         board_y = SCREEN_HEIGHT // 2 - board_height // 2
         
-        # Draw board
-        self.draw_board(player, board_x, board_y)
-        
-        # Draw player info (left side)
+        # Player info (left side) and next piece (right side, aligned with
+        # left side and moved down)
         info_x = board_x - 200
         info_y = board_y
-        self.draw_player_info(player, info_x, info_y)
-        
-        # Draw next piece (right side, aligned with left side and moved down)
         next_x = board_x + board_width + 50
-        next_y = board_y + 30  # Move down to align with left side player info
-        self.draw_next_piece(player.next_piece, next_x, next_y)
+        next_y = board_y + 30
+        sections = self._player_sections(player, board_x, board_y, info_x, info_y, next_x, next_y)
         
-        # Draw current score (right side, below next piece with more spacing)
+        # Current score (right side, below next piece with more spacing)
         ranking_y = next_y + 200  # Increased spacing from next piece (add one blank line space)
-        self.draw_ranking([player], next_x, ranking_y)
-        
-        # Draw high scores (right side, below current score with more spacing)
+        sections.append((
+            "ranking",
+            pygame.Rect(next_x - 5, ranking_y - 5, 250, 80),
+            player.score,
+            lambda: self.draw_ranking([player], next_x, ranking_y)
+        ))
+        
+        # High scores (right side, below current score with more spacing)
         high_scores = ranking_system.get_top_scores(5)
         if high_scores:
             # Add more spacing to avoid overlap with red box (80px box height + 20px margin)
-            self.draw_high_scores(high_scores, next_x, ranking_y + 120)
+            sections.append((
+                "high_scores",
+                pygame.Rect(next_x, ranking_y + 120, 400, 35 + 25 * 5),
+                tuple((e['score'], e['level'], e['lines']) for e in high_scores),
+                lambda: self.draw_high_scores(high_scores, next_x, ranking_y + 120)
+            ))
+        
+        self._draw_sections(("1p", player), sections)
     
     def draw_2player_game(self, player1, player2, ranking_system):
         """Draw two player split-screen game"""
-        self.screen.fill(BLACK)
-        
         # Calculate board dimensions for split screen
         board_width = BOARD_WIDTH * CELL_SIZE
         board_height = BOARD_HEIGHT * CELL_SIZE
         margin = 50
         
-        # Player 1 (left side)
+        # Player 1 (left side): info above, next piece to the right
         p1_board_x = margin
         p1_board_y = SCREEN_HEIGHT // 2 - board_height // 2
-        
-        self.draw_board(player1, p1_board_x, p1_board_y)
-        
-        # Player 1 info
-        p1_info_x = p1_board_x
-        p1_info_y = p1_board_y - 100
-        self.draw_player_info(player1, p1_info_x, p1_info_y)
-        
-        # Player 1 next piece
-        p1_next_x = p1_board_x + board_width + 20
-        p1_next_y = p1_board_y
-        self.draw_next_piece(player1.next_piece, p1_next_x, p1_next_y)
-        
-        # Player 2 (right side)
+        sections = self._player_sections(
+            player1,
+            p1_board_x, p1_board_y,
+            p1_board_x, p1_board_y - 100,
+            p1_board_x + board_width + 20, p1_board_y
+        )
+        
+        # Player 2 (right side): info above, next piece to the left
         p2_board_x = SCREEN_WIDTH - margin - board_width
         p2_board_y = SCREEN_HEIGHT // 2 - board_height // 2
-        
-        self.draw_board(player2, p2_board_x, p2_board_y)
-        
-        # Player 2 info
-        p2_info_x = p2_board_x
-        p2_info_y = p2_board_y - 100
-        self.draw_player_info(player2, p2_info_x, p2_info_y)
-        
-        # Player 2 next piece
-        p2_next_x = p2_board_x - 100
-        p2_next_y = p2_board_y
-        self.draw_next_piece(player2.next_piece, p2_next_x, p2_next_y)
+        sections += self._player_sections(
+            player2,
+            p2_board_x, p2_board_y,
+            p2_board_x, p2_board_y - 100,
+            p2_board_x - 100, p2_board_y
+        )
         
         # Ranking (center top)
         ranking_x = SCREEN_WIDTH // 2 - 100
         ranking_y = 20
-        self.draw_ranking([player1, player2], ranking_x, ranking_y)
-        
-        # VS text
-        vs_text = self.font_medium.render("VS", True, WHITE)
-        vs_rect = vs_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        sections.append((
+            "ranking",
+            pygame.Rect(ranking_x, ranking_y, 260, 35 + 25 * 2),
+            (player1.score, player2.score),
+            lambda: self.draw_ranking([player1, player2], ranking_x, ranking_y)
+        ))
+        
+        # VS text (static)
+        vs_center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        sections.append((
+            "vs",
+            pygame.Rect(vs_center[0] - 30, vs_center[1] - 20, 60, 40),
+            None,
+            lambda: self._draw_vs(vs_center)
+        ))
+        
+        self._draw_sections(("2p", player1, player2), sections)
+    
+    def _draw_vs(self, center):
+        """Draw the VS label between the two boards"""
+        vs_text = self.text_cache.render(self.font_medium, "VS", WHITE)
+        vs_rect = vs_text.get_rect(center=center)
         self.screen.blit(vs_text, vs_rect)
-
+    
+    def _tile_grid(self, count):
+        """Get the (columns, cell size) that fit count boards on screen largest"""
+        grid = self._tile_grids.get(count)
+        if grid is not None:
+            return grid
+        
+        margin, gap, label_height = 20, 10, 22
+        best = (1, 0)
+        for columns in range(1, count + 1):
+            rows = (count + columns - 1) // columns
+            cell_w = ((SCREEN_WIDTH - 2 * margin) // columns - gap) // BOARD_WIDTH
+            cell_h = ((SCREEN_HEIGHT - 2 * margin) // rows - gap - label_height) // BOARD_HEIGHT
+            cell = min(cell_w, cell_h)
+            if cell > best[1]:
+                best = (columns, cell)
+        
+        self._tile_grids[count] = best
+        return best
+    
+    def draw_party_game(self, players):
+        """Draw any number of boards tiled across the screen
+        
+        The cell size shrinks to fit the grid. Board layers come from the
+        per-player cache, and only tiles whose board or score changed are
+        redrawn and pushed.
+        """
+        columns, cell = self._tile_grid(len(players))
+        rows = (len(players) + columns - 1) // columns
+        gap, label_height = 10, 22
+        board_width = BOARD_WIDTH * cell
+        board_height = BOARD_HEIGHT * cell
+        tile_width = board_width + gap
+        tile_height = label_height + board_height + gap
+        
+        # Center the grid
+        left = (SCREEN_WIDTH - columns * tile_width + gap) // 2
+        top = (SCREEN_HEIGHT - rows * tile_height + gap) // 2
+        
+        sections = []
+        for i, player in enumerate(players):
+            tile_x = left + (i % columns) * tile_width
+            tile_y = top + (i // columns) * tile_height
+            board_y = tile_y + label_height
+            name = f"p{player.player_id}"
+            sections.append((
+                name + "_label",
+                pygame.Rect(tile_x, tile_y, board_width, label_height),
+                (player.score, player.game_over),
+                lambda player=player, x=tile_x, y=tile_y, w=board_width:
+                    self._draw_tile_label(player, x, y, w)
+            ))
+            sections.append((
+                name + "_board",
+                pygame.Rect(tile_x, board_y, board_width, board_height),
+                self._board_key(player),
+                lambda player=player, x=tile_x, y=board_y:
+                    self.draw_board(player, x, y, board_width, board_height)
+            ))
+        
+        self._draw_sections(("party", tuple(players), cell), sections)
+    
+    def _draw_tile_label(self, player, x, y, width):
+        """Draw a party-mode board's player number and score above it"""
+        color = GRAY if player.game_over else WHITE
+        label = self.text_cache.render(self.font_tiny, f"P{player.player_id}", color)
+        self.screen.blit(label, (x, y + 2))
+        score = self.text_cache.render(self.font_tiny, str(player.score), color)
+        self.screen.blit(score, score.get_rect(topright=(x + width, y + 2)))
@@ -0,0 +1,75 @@
+"""
+Zobrist hashing
+Fixed 64-bit keys for board cells, the falling piece and the piece queue
+"""
+
+from functools import lru_cache
+from .randomizer import PIECE_ORDER
+
+# Keys are derived from this seed, so hashes are stable across runs and machines
+ZOBRIST_SEED = 0x7E7215C0FFEE5EED
+
+_MASK64 = (1 << 64) - 1
+
+# Key domains, so cell, piece, queue and line keys never coincide
+_CELL = 1
+_PIECE = 2
+_QUEUE = 3
+_LINES = 4
+
+
+def mix64(value):
+    """SplitMix64 finalizer: scramble a 64-bit value into a well-spread key"""
+    z = (value + ZOBRIST_SEED + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+@lru_cache(maxsize=None)
+def cell_keys(width, height):
+    """Get keys[y][x] for every cell of a board"""
+    return tuple(
+        tuple(mix64((_CELL << 56) | (y << 16) | x) for x in range(width))
+        for y in range(height)
+    )
+
+
+@lru_cache(maxsize=None)
+def full_row_keys(width, height):
+    """Get the combined key of each completely filled row"""
+    keys = []
+    for row in cell_keys(width, height):
+        combined = 0
+        for key in row:
+            combined ^= key
+        keys.append(combined)
+    return tuple(keys)
+
+
+def piece_key(shape_type, rotation, x, y):
+    """Get the key of a falling piece state"""
+    shape = PIECE_ORDER.index(shape_type)
+    return mix64((_PIECE << 56) | (shape << 40) | (rotation << 32) | ((x & 0xFFFF) << 16) | (y & 0xFFFF))
+
+
+def queue_key(slot, shape_type):
+    """Get the key of shape_type at position slot of the piece queue"""
+    return mix64((_QUEUE << 56) | (slot << 8) | PIECE_ORDER.index(shape_type))
+
+
+def lines_key(lines):
+    """Get the key of a cleared-line count (for results that depend on it)"""
+    return mix64((_LINES << 56) | lines)
+
+
+def rows_hash(rows, width):
+    """Hash a whole board given as row bitmasks (bit x = column x)"""
+    keys = cell_keys(width, len(rows))
+    value = 0
+    for y, row in enumerate(rows):
+        while row:
+            low = row & -row
+            value ^= keys[y][low.bit_length() - 1]
+            row ^= low
+    return value
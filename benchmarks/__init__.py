@@ -0,0 +1,4 @@
+"""
+Benchmark suite for engine and renderer hot paths
+Run with: python -m benchmarks
+"""
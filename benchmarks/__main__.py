@@ -0,0 +1,114 @@
+"""
+Benchmark runner
+Times every case, compares against a JSON baseline and exits non-zero when
+any case got slower than the allowed threshold
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+# Renderer cases draw offscreen; no window is needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from .cases import CASES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+BACKENDS = {'list': False, 'bitboard': True}
+
+
+def run_case(case, number, use_bitboard, repeat):
+    """Get the best time per operation (ns) over `repeat` runs"""
+    best = min(case(number, use_bitboard) for _ in range(repeat))
+    return best / number * 1e9
+
+
+def run_all(selected, repeat, scale):
+    """Run the selected cases on every backend, returning {metric: ns/op}"""
+    results = {}
+    for name, (case, number) in CASES.items():
+        if selected and name not in selected:
+            continue
+        for backend, use_bitboard in BACKENDS.items():
+            metric = f"{name}[{backend}]"
+            results[metric] = run_case(case, max(1, int(number * scale)), use_bitboard, repeat)
+            print(f"{metric:<28}{_format_ns(results[metric]):>12}", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Get (metric, baseline, current, change %) for every regressed metric"""
+    regressions = []
+    for metric, current in results.items():
+        previous = baseline.get(metric)
+        if previous is None:
+            continue
+        change = (current - previous) / previous * 100
+        if change > threshold:
+            regressions.append((metric, previous, current, change))
+    return regressions
+
+
+def _format_ns(ns):
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def main():
+    """Run the benchmarks from the command line"""
+    parser = argparse.ArgumentParser(description="Tetris engine and renderer benchmarks")
+    parser.add_argument('cases', nargs='*', help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="write results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=15.0,
+                        help="allowed slowdown in percent before failing (default 15)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per case; the best is kept")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply operations per run")
+    args = parser.parse_args()
+    
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    
+    results = run_all(set(args.cases), args.repeat, args.scale)
+    
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f).get('results', {})
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': baseline,
+            }, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save to create one")
+        return 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.threshold)
+    for metric, previous, current, change in regressions:
+        print(f"REGRESSION {metric}: {_format_ns(previous)} -> {_format_ns(current)} "
+              f"(+{change:.1f}%)")
+    if regressions:
+        return 1
+    print(f"no regressions beyond {args.threshold:g}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark cases
+Each case runs `number` operations on fresh fixtures and returns the elapsed
+seconds, leaving fixture setup out of the timing
+"""
+
+import time
+from app.config import BOARD_WIDTH, BOARD_HEIGHT, CELL_SIZE
+from app.engine import Engine
+from app.engine.tournament import play_game
+from .fixtures import (
+    FIXTURE_SEED, make_player, make_full_rows_player, make_wall_player, copies,
+    GreedyAgent
+)
+
+
+def collision(number, use_bitboard=False):
+    """_check_collision for the current piece at every column offset"""
+    player = make_player(use_bitboard=use_bitboard)
+    piece = player.current_piece
+    offsets = list(range(-piece.x, BOARD_WIDTH - piece.x)) * (number // BOARD_WIDTH + 1)
+    offsets = offsets[:number]
+    check = player._check_collision
+    started = time.perf_counter()
+    for dx in offsets:
+        check(piece, dx, 4)
+    return time.perf_counter() - started
+
+
+def rotate_with_kicks(number, use_bitboard=False):
+    """rotate_piece for an I piece against the wall (exercises kicks)"""
+    player = make_wall_player(use_bitboard=use_bitboard)
+    rotate = player.rotate_piece
+    started = time.perf_counter()
+    for _ in range(number):
+        rotate()
+    return time.perf_counter() - started
+
+
+def hard_drop(number, use_bitboard=False):
+    """hard_drop (lock, line check, spawn) on copies of a mid-game board"""
+    players = copies(make_player(use_bitboard=use_bitboard), number)
+    started = time.perf_counter()
+    for player in players:
+        player.hard_drop()
+    return time.perf_counter() - started
+
+
+def clear_lines(number, use_bitboard=False):
+    """_clear_lines removing four full rows"""
+    players = copies(make_full_rows_player(4, use_bitboard=use_bitboard), number)
+    rows = range(BOARD_HEIGHT - 4, BOARD_HEIGHT)
+    started = time.perf_counter()
+    for player in players:
+        player._clear_lines(rows)
+    return time.perf_counter() - started
+
+
+def get_blocks(number, use_bitboard=False):
+    """Tetromino.get_blocks for the current piece"""
+    piece = make_player(use_bitboard=use_bitboard).current_piece
+    started = time.perf_counter()
+    for _ in range(number):
+        piece.get_blocks()
+    return time.perf_counter() - started
+
+
+def _offscreen_ui():
+    """Get a UI drawing into an offscreen surface"""
+    import pygame
+    from app.ui import UI
+    pygame.init()
+    return UI(pygame.Surface((BOARD_WIDTH * CELL_SIZE, BOARD_HEIGHT * CELL_SIZE)))
+
+
+def draw_board(number, use_bitboard=False):
+    """UI.draw_board with the locked-cell layer cached"""
+    ui = _offscreen_ui()
+    player = make_player(use_bitboard=use_bitboard)
+    ui.draw_board(player, 0, 0)
+    started = time.perf_counter()
+    for _ in range(number):
+        ui.draw_board(player, 0, 0)
+    return time.perf_counter() - started
+
+
+def draw_board_cold(number, use_bitboard=False):
+    """UI.draw_board after every board change (layer rebuilt each call)"""
+    ui = _offscreen_ui()
+    player = make_player(use_bitboard=use_bitboard)
+    started = time.perf_counter()
+    for _ in range(number):
+        player.board_version += 1
+        ui.draw_board(player, 0, 0)
+    return time.perf_counter() - started
+
+
+def headless_game(number, use_bitboard=False):
+    """Full headless game played by a deterministic agent"""
+    engine = Engine()
+    for player in engine.players:
+        player.use_bitboard = use_bitboard
+    started = time.perf_counter()
+    for i in range(number):
+        play_game(engine, [GreedyAgent()], FIXTURE_SEED + i, max_ticks=20000)
+    return time.perf_counter() - started
+
+
+# name -> (case, operations per run); every case runs on both board backends
+CASES = {
+    'collision': (collision, 20000),
+    'rotate_with_kicks': (rotate_with_kicks, 20000),
+    'hard_drop': (hard_drop, 500),
+    'clear_lines': (clear_lines, 500),
+    'get_blocks': (get_blocks, 50000),
+    'draw_board': (draw_board, 2000),
+    'draw_board_cold': (draw_board_cold, 200),
+    'headless_game': (headless_game, 10),
+}
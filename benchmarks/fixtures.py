@@ -0,0 +1,112 @@
+"""
+Deterministic fixtures for the benchmarks
+Boards are built by playing seeded pieces through the public Player API
+"""
+
+import copy
+from app.config import BOARD_WIDTH, BOARD_HEIGHT
+from app.engine import MOVE_LEFT, MOVE_RIGHT, ROTATE, HARD_DROP
+from app.player import Player
+from app.randomizer import Randomizer
+
+FIXTURE_SEED = 20240601
+
+
+def make_player(stack_height=8, use_bitboard=False, seed=FIXTURE_SEED):
+    """Get a player whose stack has grown to about stack_height rows"""
+    player = Player(1, BOARD_WIDTH, BOARD_HEIGHT, use_bitboard=use_bitboard, seed=seed)
+    placement = Randomizer(seed)
+    while max(player.column_heights) < stack_height and not player.game_over:
+        for _ in range(placement.randbelow(4)):
+            player.rotate_piece()
+        target = placement.randbelow(BOARD_WIDTH)
+        for _ in range(BOARD_WIDTH):
+            if player.current_piece.x < target:
+                player.move(1, 0)
+            elif player.current_piece.x > target:
+                player.move(-1, 0)
+        player.hard_drop()
+    return player
+
+
+def make_full_rows_player(full_rows=4, use_bitboard=False):
+    """Get a player with full_rows complete rows at the bottom (not yet cleared)"""
+    player = make_player(stack_height=4, use_bitboard=use_bitboard)
+    for y in range(BOARD_HEIGHT - full_rows, BOARD_HEIGHT):
+        for x in range(BOARD_WIDTH):
+            if player.board[y][x] == 0:
+                if use_bitboard:
+                    player.board.set_cell(x, y, (255, 255, 255))
+                else:
+                    player.board[y][x] = (255, 255, 255)
+                player.column_heights[x] = max(player.column_heights[x], BOARD_HEIGHT - y)
+        player.row_fill[y] = BOARD_WIDTH
+    return player
+
+
+def make_wall_player(use_bitboard=False):
+    """Get a player with an I piece pressed against the right wall"""
+    player = make_player(stack_height=4, use_bitboard=use_bitboard)
+    while player.current_piece.shape_type != 'I':
+        player.hard_drop()
+    for _ in range(BOARD_WIDTH):
+        player.move(1, 0)
+    return player
+
+
+def copies(player, count):
+    """Get independent deep copies of a fixture player"""
+    return [copy.deepcopy(player) for _ in range(count)]
+
+
+class GreedyAgent:
+    """Deterministic agent: drops each piece where it leaves the lowest, flattest stack"""
+    
+    def __init__(self):
+        self.piece = None
+        self.target = None
+        self.moves = 0
+    
+    def _plan(self, player):
+        """Get the (rotation, x) with the best resulting surface"""
+        piece = player.current_piece.copy()
+        height = player.board_height
+        best = None
+        for rotation in range(len(piece.tables)):
+            table = piece.tables[rotation]
+            piece.rotation_index = rotation
+            for x in range(-table.min_x, player.board_width - table.max_x):
+                piece.x = x
+                piece.y = player.current_piece.y
+                if player._check_collision(piece):
+                    continue
+                piece.y += player.drop_distance(piece)
+                heights = list(player.column_heights)
+                holes = 0
+                for bx, by in table.bottom:
+                    holes += height - heights[x + bx] - 1 - (piece.y + by)
+                for bx, by in table.blocks:
+                    heights[x + bx] = max(heights[x + bx], height - piece.y - by)
+                bumpiness = sum(abs(heights[i + 1] - heights[i]) for i in range(len(heights) - 1))
+                cost = 4 * holes + sum(heights) + bumpiness
+                if best is None or cost < best[0]:
+                    best = (cost, rotation, x)
+        return best[1:] if best else None
+    
+    def __call__(self, player):
+        piece = player.current_piece
+        if piece is not self.piece:
+            self.piece = piece
+            self.target = self._plan(player)
+            self.moves = 0
+        self.moves += 1
+        if self.target is None or self.moves > player.board_width + 4:
+            return HARD_DROP
+        rotation, x = self.target
+        if piece.rotation_index != rotation:
+            return ROTATE
+        if piece.x < x:
+            return MOVE_RIGHT
+        if piece.x > x:
+            return MOVE_LEFT
+        return HARD_DROP
@@ -3,41 +3,131 @@ Main entry point for Tetris game
 Initializes pygame and coordinates game flow
 """
 
+import time
+
+# Taken before the other imports so the startup report includes them
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import os
 import pygame
 import sys
 from app.config import *
-from app.game import Game
+from app.game import ACTION_KEYS, Game
 from app.menu import Menu
+from app.profiler import FrameProfiler, NullProfiler
+from app.timestep import FixedTimestep
 from app.ui import UI
 from app.ranking import RankingSystem
 
+IMPORTS_DONE = time.perf_counter()
+
+
+def start_replay(game):
+    """Start recording a game to a new file in REPLAY_DIR"""
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    seed = game.players[0].randomizer.seed
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{len(game.players)}p-{seed:016x}.trpl"
+    game.start_recording(os.path.join(REPLAY_DIR, filename))
+
+
+def wait_for_events(timeout_ms):
+    """Block until input arrives (or the timeout passes) and get all pending events"""
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="time each frame phase, show an overlay (F3 toggles) and write a trace on exit"
+    )
+    parser.add_argument(
+        '--profile-out',
+        default=PROFILER_OUTPUT,
+        help="trace file written on exit (.json or .csv)"
+    )
+    parser.add_argument(
+        '--fps',
+        type=int,
+        default=FPS,
+        help="render frame rate cap; the simulation runs at a fixed step regardless"
+    )
+    parser.add_argument(
+        '--startup-time',
+        action='store_true',
+        help="print how long imports, display setup and the first frame took"
+    )
+    return parser.parse_args()
+
 
 def main():
     """Main game loop"""
-    pygame.init()
+    args = parse_args()
+    if PARTY_PLAYERS > len(ACTION_KEYS):
+        # Boards without keys would just top out and end the match
+        sys.exit(f"PARTY_PLAYERS is {PARTY_PLAYERS}, but there are key layouts "
+                 f"for only {len(ACTION_KEYS)} players")
+    profiler = FrameProfiler(budget_ms=1000 / args.fps) if args.profile else NullProfiler()
+    timestep = FixedTimestep()
+    
+    # Only the display: fonts start on first use (app.text_cache), and
+    # audio and joystick support are never used
+    display_started = time.perf_counter()
+    pygame.display.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Tetris")
     clock = pygame.time.Clock()
+    display_ready = time.perf_counter()
     
     menu = Menu(screen)
-    ranking_system = RankingSystem()
+    # The score history is read in the background after the first frame
+    ranking_system = RankingSystem(preload=False)
     ui = UI(screen)
+    first_frame = True
     
     current_game = None
     game_mode = None
     showing_game_over = False
     showing_rankings = False
+    # What the idle screens last drew; they redraw only when it changes
+    idle_key = None
+    # Replays whose files are still being written out
+    pending_replays = []
     
     running = True
     
     while running:
-        dt = clock.tick(FPS)
+        idle = current_game is None or showing_game_over or showing_rankings
+        waiting = idle and idle_key is not None
+        profiler.begin_frame(idle=waiting)
+        if waiting:
+            # Nothing animates on these screens: once drawn, sleep until
+            # there is input
+            events = wait_for_events(IDLE_WAIT_MS)
+            dt = clock.tick()
+        else:
+            dt = clock.tick(args.fps)
+            events = pygame.event.get()
+        profiler.mark('wait')
         
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                idle_key = None
+                ui.invalidate()
             
-            if showing_rankings:
+            if profiler.enabled and event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.show_overlay = not profiler.show_overlay
+                idle_key = None
+                ui.invalidate()
+            elif showing_rankings:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     showing_rankings = False
             elif showing_game_over:
@@ -55,28 +145,60 @@ def main():
                     running = False
                 elif selected == 3:  # Rankings
                     showing_rankings = True
-                elif selected in [1, 2]:  # Start game
+                elif selected in [1, 2, PARTY_MODE]:  # Start game
                     game_mode = selected
-                    current_game = Game(num_players=selected)
+                    num_players = PARTY_PLAYERS if selected == PARTY_MODE else selected
+                    current_game = Game(num_players=num_players)
                     showing_game_over = False
+                    timestep.reset()
+                    # This frame's dt is time spent waiting on the menu,
+                    # not game time
+                    dt = 0
+                    ui.invalidate()
+                    if RECORD_REPLAYS:
+                        start_replay(current_game)
+        
+        profiler.mark('events')
         
-        # Update game state
+        # Update game state in fixed steps, however long the frame took
         if current_game and not showing_game_over:
-            current_game.update(dt)
+            current_game.advance(timestep.step_ms, timestep.advance(dt))
             
             if current_game.is_game_over():
                 showing_game_over = True
-                # Save high scores for single player
+                # The file is finished in the background; shutdown waits for it
+                recorder = current_game.stop_recording()
+                if recorder is not None:
+                    pending_replays.append(recorder)
+                # Record every single-player game in the score history
                 if game_mode == 1:
                     player = current_game.players[0]
-                    if ranking_system.is_high_score(player.score):
-                        ranking_system.add_score(
-                            player.score,
-                            player.level,
-                            player.lines_cleared
-                        )
+                    ranking_system.add_score(
+                        player.score,
+                        player.level,
+                        player.lines_cleared
+                    )
+        
+        profiler.mark('update')
         
         # Draw
+        dirty_rects = None
+        if current_game is None or showing_game_over or showing_rankings:
+            key = (showing_rankings, showing_game_over, game_mode, menu.selected_option)
+            if key == idle_key:
+                # Screen is unchanged; skip drawing and presenting, except
+                # for the overlay, which covers whatever is beneath it
+                overlay_rect = profiler.draw_overlay(screen, ui.text_cache, ui.font_small)
+                if overlay_rect:
+                    pygame.display.update(overlay_rect)
+                profiler.mark('draw')
+                profiler.mark('present')
+                profiler.end_frame()
+                continue
+            idle_key = key
+        else:
+            idle_key = None
+        
         if showing_rankings:
             ui.draw_rankings_screen(ranking_system)
         elif showing_game_over and current_game:
@@ -90,11 +212,46 @@ def main():
                     current_game.players[1],
                     ranking_system
                 )
+            else:
+                ui.draw_party_game(current_game.players)
+            dirty_rects = ui.dirty_rects
         else:
             menu.draw()
+        overlay_rect = profiler.draw_overlay(screen, ui.text_cache, ui.font_small)
+        if overlay_rect and dirty_rects is not None:
+            # Sections redrawn under the overlay were painted over it
+            dirty_rects = dirty_rects + [overlay_rect]
+        profiler.mark('draw')
         
-        pygame.display.flip()
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            # Only push the parts of the screen that changed this frame
+            pygame.display.update(dirty_rects)
+        profiler.mark('present')
+        profiler.end_frame()
+        
+        if first_frame:
+            first_frame = False
+            if args.startup_time:
+                presented = time.perf_counter()
+                print(
+                    f"Startup: imports {(IMPORTS_DONE - PROCESS_STARTED) * 1000:.0f} ms, "
+                    f"display {(display_ready - display_started) * 1000:.0f} ms, "
+                    f"first frame {(presented - display_ready) * 1000:.0f} ms "
+                    f"(total {(presented - PROCESS_STARTED) * 1000:.0f} ms)"
+                )
+            ranking_system.load_in_background()
     
+    if current_game:
+        recorder = current_game.stop_recording()
+        if recorder is not None:
+            pending_replays.append(recorder)
+    for recorder in pending_replays:
+        recorder.wait()
+    ranking_system.close()
+    if profiler.enabled:
+        profiler.export(args.profile_out)
     pygame.quit()
     sys.exit()
 